@@ -1,54 +1,118 @@
-from langchain.agents import initialize_agent, AgentType
-from langchain_openai import ChatOpenAI
-from langchain.tools import Tool
-from leadflow_ai.schemas.lead import AppState
-from langchain.tools import tool
-from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
+import os
 import re
+import asyncio
+import logging
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.language_models import BaseChatModel
+from leadflow_ai.schemas.lead import AppState
+from langchain_core.tools import tool
+from leadflow_ai.services.page_store import fetch_page
+from leadflow_ai.services.providers import Lazy, chat_model
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Agent fallbacks running at once across the process
+LLM_AGENT_CONCURRENCY = int(os.getenv("LLM_AGENT_CONCURRENCY", "4"))
+# Reason/act steps (one page fetch each) before the agent must answer
+LLM_AGENT_MAX_STEPS = int(os.getenv("LLM_AGENT_MAX_STEPS", "4"))
+# Tokens the agent may spend on one website, prompts and completions together
+LLM_AGENT_MAX_TOKENS = int(os.getenv("LLM_AGENT_MAX_TOKENS", "20000"))
+# Wall-clock seconds per website
+LLM_AGENT_TIMEOUT = float(os.getenv("LLM_AGENT_TIMEOUT", "60"))
+
+EMAIL_RE = re.compile(r"[\w\.-]+@[\w\.-]+\.\w+")
+
 
 @tool
 async def fetch_page_html(url: str) -> str:
-    """Fetch visible text from a webpage and return up to 6000 characters."""
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        page = browser.new_page()
-        try:
-            page.goto(url, timeout=10000)
-            page.wait_for_timeout(2000)
-            content = page.content()
-            soup = BeautifulSoup(content, "html.parser")
-            text = soup.get_text(separator=" ", strip=True)
-            trimmed_text = text[:6000]  # Keep it safe for GPT-4 input
-        except Exception as e:
-            trimmed_text = f"ERROR: {e}"
-        finally:
-            browser.close()
+    """Fetch the visible text of a webpage, up to 6000 characters. Input must be a full URL like https://site.com/contact."""
+    try:
+        # Pages the extractor already loaded this run come from the page store
+        page = await fetch_page(url, timeout=10000)
+        trimmed_text = page.text[:6000]  # Keep it safe for GPT-4 input
+    except Exception as e:
+        trimmed_text = f"ERROR: {e}"
     return trimmed_text
 
 
 def is_valid_email(email: str) -> bool:
     pattern = r'^[\w\.-]+@[\w\.-]+\.\w+$'
     return bool(re.match(pattern, email)) and "example.com" not in email and "email.com" not in email
-llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0)
 
-tools = [
-    Tool(
-        name="fetch_page_html",
-        func=fetch_page_html,
-        description="Fetch the HTML content of a webpage. Input must be a full URL like https://site.com/contact."
+
+# Created on the first fallback, not at import
+agent_llm = Lazy(lambda: chat_model("gpt-3.5-turbo"), "email agent model")
+
+tools = [fetch_page_html]
+
+
+class TokenBudgetExceeded(Exception):
+    pass
+
+
+class _TokenBudget(AsyncCallbackHandler):
+    """Stops the agent once its LLM calls have used more than ``limit`` tokens."""
+    raise_error = True
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+
+    async def on_llm_end(self, response, **kwargs):
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                self.used += usage.get("total_tokens", 0)
+        if self.used > self.limit:
+            raise TokenBudgetExceeded(f"used {self.used} of {self.limit} tokens")
+
+
+_limit: asyncio.Semaphore | None = None
+_limit_loop = None
+
+
+def _agent_limit() -> asyncio.Semaphore:
+    global _limit, _limit_loop
+    if _limit is None or _limit_loop is not asyncio.get_running_loop():
+        _limit, _limit_loop = asyncio.Semaphore(LLM_AGENT_CONCURRENCY), asyncio.get_running_loop()
+    return _limit
+
+
+# id(llm) -> (llm, executor); the model is kept so its id stays unique
+_agents: dict[int, tuple] = {}
+
+
+def build_agent(llm: BaseChatModel):
+    """The ReAct executor for ``llm``, built on first use and reused by every fallback."""
+    cached = _agents.get(id(llm))
+    if cached is None:
+        cached = _agents[id(llm)] = (llm, _new_agent(llm))
+    return cached[1]
+
+
+def _new_agent(llm: BaseChatModel):
+    # langchain.agents takes about a second to import; only fallbacks pay for it
+    from langchain.agents import initialize_agent, AgentType
+    return initialize_agent(
+        tools,
+        llm,
+        agent=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
+        verbose=False,
+        handle_parsing_errors=True,
+        max_iterations=LLM_AGENT_MAX_STEPS,
+        # Checked between steps; the wait_for around ainvoke also cuts a step short
+        max_execution_time=LLM_AGENT_TIMEOUT,
     )
-]
 
-agent = initialize_agent(
-    tools,
-    llm,
-    agent=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
-    verbose=False,
-    handle_parsing_errors=True
-)
 
-def find_email_for_website_with_llm(website: str, llm: ChatOpenAI) -> str | None:
+async def find_email_for_website_with_llm(website: str, llm: BaseChatModel | None = None) -> str | None:
+    """
+    Ask the ReAct agent for the website's contact email, without blocking the
+    event loop. Each run is held to LLM_AGENT_MAX_STEPS steps,
+    LLM_AGENT_MAX_TOKENS tokens and LLM_AGENT_TIMEOUT seconds, and at most
+    LLM_AGENT_CONCURRENCY runs go at once; a run that hits a limit finds nothing.
+    """
     prompt = f"""
 You're a web research agent. Your ONLY task is to extract a valid business contact email address from the website: {website}
 
@@ -66,16 +130,28 @@ Do NOT make up or guess emails. Only return what you actually see.
 IMPORTANT: Do not return placeholder emails like contact@email.com or info@example.com unless you are 100% sure it's in the HTML.
 """
 
-    try:
-        result = agent.run(prompt)
-    except Exception as e:
-        return None
+    budget = _TokenBudget(LLM_AGENT_MAX_TOKENS)
+    async with _agent_limit():
+        try:
+            result = await asyncio.wait_for(
+                build_agent(llm or agent_llm.get()).ainvoke({"input": prompt}, config={"callbacks": [budget]}),
+                timeout=LLM_AGENT_TIMEOUT,
+            )
+        except asyncio.TimeoutError:
+            logging.warning(f"⏱️ Email agent timed out after {LLM_AGENT_TIMEOUT:.0f}s for {website}")
+            return None
+        except TokenBudgetExceeded as e:
+            logging.warning(f"Email agent stopped for {website}: {e}")
+            return None
+        except Exception as e:
+            logging.warning(f"Email agent failed for {website}: {e}")
+            return None
 
-    # Extract email from the agent's final answer
-    match = re.search(r"Final Answer:\s*(.+@.+\..+)", result)
+    # The executor strips "Final Answer:", so look for the address itself
+    match = EMAIL_RE.search(result.get("output", ""))
     if match:
-        email = match.group(1).strip()
+        email = match.group(0).strip(".")
         if is_valid_email(email):
             return email
 
-    return None  # fallback if nothing valid was found
\ No newline at end of file
+    return None  # fallback if nothing valid was found
@@ -2,26 +2,20 @@ from langgraph import Graph, Node
 from leadflow_ai.services.hunter import get_contacts
 from leadflow_ai.db.pinecone import embed_interests, upsert_lead, search_businesses
 from leadflow_ai.db.supabase import fetch_all_businesses
-from langchain import OpenAI
-import os
+from leadflow_ai.services.providers import openai_client
 
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
 
-OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
-
-# Initialize OpenAI client
-client = OpenAI(api_key=OPENAI_API_KEY)
-
 # Define nodes
 class ReceiveLead(Node):
     def run(self, domain: str, basic_info: dict):
         return {'domain': domain, 'basic_info': basic_info}
 
 class EnrichLead(Node):
-    def run(self, domain: str):
-        contacts = get_contacts(domain)
+    async def run(self, domain: str):
+        contacts = await get_contacts(domain)
         return {'contacts': contacts}
 
 class EmbedAndScore(Node):
@@ -39,7 +33,7 @@ class GenerateMessage(Node):
     def run(self, lead_info: dict, businesses: list):
         # Use LangChain and OpenAI to generate a personalized message
         prompt = f"Generate a personalized message for {lead_info['name']}"
-        response = client.responses.create(
+        response = openai_client().responses.create(
             model="gpt-4o",
             input=prompt
         )
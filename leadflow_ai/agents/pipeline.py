@@ -0,0 +1,52 @@
+from functools import lru_cache
+from langgraph.graph import StateGraph, END
+from leadflow_ai.schemas.lead import AppState
+from leadflow_ai.services.scrape_gogglemaps import scrape_google_maps_node
+from leadflow_ai.services.email_finder_tool import update_business_emails
+from leadflow_ai.services.summirize_business_and_pain_points import summarize_business
+from leadflow_ai.services.generate_outreach_email import generate_outreach_email_node
+from leadflow_ai.services.page_store import page_store_scope
+
+# Pipeline stages in execution order
+STAGES = {
+    "scrape_google_maps_node": scrape_google_maps_node,
+    "update_business_emails": update_business_emails,
+    "summarize_business": summarize_business,
+    "generate_outreach_email": generate_outreach_email_node,
+}
+
+
+def resolve_stages(skip: list[str] | tuple[str, ...] = ()) -> tuple[str, ...]:
+    """All stages except ``skip``, in execution order."""
+    unknown = set(skip) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown pipeline stages: {sorted(unknown)}")
+    stages = tuple(name for name in STAGES if name not in skip)
+    if not stages:
+        raise ValueError("At least one pipeline stage must run")
+    return stages
+
+
+def build_pipeline(stages: tuple[str, ...] = tuple(STAGES)):
+    """Build and compile a linear LangGraph running ``stages`` in order."""
+    builder = StateGraph(AppState)
+    for name in stages:
+        builder.add_node(name, STAGES[name])
+    builder.set_entry_point(stages[0])
+    for current, following in zip(stages, stages[1:]):
+        builder.add_edge(current, following)
+    builder.add_edge(stages[-1], END)
+    return builder.compile()
+
+
+@lru_cache(maxsize=None)
+def get_pipeline(stages: tuple[str, ...] = tuple(STAGES)):
+    """Compiled graph for ``stages``, built once per process and shared by every caller."""
+    return build_pipeline(stages)
+
+
+async def run_pipeline(state: AppState, skip: list[str] | tuple[str, ...] = ()) -> dict:
+    graph = get_pipeline(resolve_stages(skip))
+    # One page store per run so each website is navigated once across all nodes
+    with page_store_scope():
+        return await graph.ainvoke(state)
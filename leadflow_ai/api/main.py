@@ -4,22 +4,53 @@ import asyncio
 if sys.platform.startswith("win"):
     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse
 from leadflow_ai.api.routes import router as lead_router
 from leadflow_ai.schemas.lead import AppState
-from langgraph.graph import StateGraph, START, END
-from leadflow_ai.agents.email_finder_agent import find_email_for_website_with_llm
-from leadflow_ai.services.scrape_gogglemaps import scrape_google_maps_node
-from leadflow_ai.services.email_finder_tool import update_business_emails
-from leadflow_ai.services.summirize_business_and_pain_points import summarize_business
-from leadflow_ai.services.generate_outreach_email import generate_outreach_email_node
+from leadflow_ai.agents.pipeline import get_pipeline, resolve_stages, run_pipeline
+from leadflow_ai.services.browser_pool import close_browser_pool
+from leadflow_ai.services.http_client import close_http_client
+from leadflow_ai.services.cache import get_page_cache
+from leadflow_ai.services.fetcher import fetch_tiers
+from leadflow_ai.services.resource_policy import resource_stats
+from leadflow_ai.services.llm_cache import get_llm_cache
+from leadflow_ai.services.geocode import get_geocode_cache
+from leadflow_ai.services.pipeline_stream import stream_pipeline
+from leadflow_ai.services.jobs import JobManager, QueueFullError
+from leadflow_ai.db.jobs import JobStore
+from leadflow_ai.db.batch_writer import BatchWriter
+from leadflow_ai.db.targets import TargetIndex
+from contextlib import asynccontextmanager
 import logging
+import json
 import os
 from pydantic import BaseModel
 from fastapi.middleware.cors import CORSMiddleware
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Compile the default pipeline once up front; requests reuse it
+    get_pipeline()
+    app.state.jobs = JobManager(JobStore())
+    app.state.jobs.start()
+    # Supabase writes are buffered and sent in bulk over the shared client
+    app.state.target_writer = BatchWriter("local_targets", on_conflict="unique_hash")
+    app.state.lead_writer = BatchWriter("leads")
+    app.state.target_index = TargetIndex()
+    app.state.target_writer.start()
+    app.state.lead_writer.start()
+    yield
+    await app.state.jobs.stop()
+    await app.state.target_writer.close()
+    await app.state.lead_writer.close()
+    # Shut down the shared Chromium and HTTP connection pool used by the services
+    await close_browser_pool()
+    await close_http_client()
+
 # Initialize the FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -35,29 +66,87 @@ app.include_router(lead_router)
 @app.get("/")
 async def root():
     return {"message": "Welcome to the LeadFlow API"} 
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return {"pages": get_page_cache().stats(), "llm": get_llm_cache().stats(), "geocode": get_geocode_cache().stats(),
+            "fetch_tiers": dict(fetch_tiers), "resources": resource_stats()}
+
 class PipelineRequest(BaseModel):
     search_query: str
     max_links: int = 10
+    bypass_llm_cache: bool = False
+    # Stage names to leave out, e.g. ["generate_outreach_email"]
+    skip_stages: list[str] = []
+
+def _validated_skip(request: PipelineRequest) -> list[str]:
+    try:
+        resolve_stages(request.skip_stages)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return request.skip_stages
 
 @app.post("/run-leadflow-pipeline")
 async def run_leadflow_pipeline(request: PipelineRequest):
-    state = AppState(search_query=request.search_query, max_links=request.max_links)
-    builder = StateGraph(AppState)
-    builder.add_node("scrape_google_maps_node", scrape_google_maps_node)
-    builder.add_node("update_business_emails", update_business_emails)
-    builder.set_entry_point("scrape_google_maps_node")
-    builder.add_edge("scrape_google_maps_node", "update_business_emails")
-    builder.add_node("summarize_business", summarize_business)
-    builder.add_edge("update_business_emails", "summarize_business")
-    builder.add_node("generate_outreach_email", generate_outreach_email_node)
-    builder.add_edge("summarize_business", "generate_outreach_email")
-    builder.add_edge("generate_outreach_email", END)
-    graph = builder.compile()
-    results = await graph.ainvoke(state)
+    state = AppState(search_query=request.search_query, max_links=request.max_links,
+                     bypass_llm_cache=request.bypass_llm_cache)
+    results = await run_pipeline(state, skip=_validated_skip(request))
     # For serialization, convert businesses to dict
     results["businesses"] = [b.model_dump() if hasattr(b, "model_dump") else b.__dict__ for b in results["businesses"]]
     return results
 
+@app.post("/run-leadflow-pipeline/stream")
+async def run_leadflow_pipeline_stream(request: PipelineRequest):
+    """Same pipeline, streamed as NDJSON: one event line per business per finished stage."""
+    state = AppState(search_query=request.search_query, max_links=request.max_links,
+                     bypass_llm_cache=request.bypass_llm_cache)
+    skip = _validated_skip(request)
+
+    async def ndjson():
+        async for event in stream_pipeline(state, skip=skip):
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+def get_job_manager(request: Request) -> JobManager:
+    return request.app.state.jobs
+
+def _job_status(job: dict) -> dict:
+    return {key: job[key] for key in ("id", "status", "progress", "error", "created_at", "updated_at")}
+
+@app.post("/jobs", status_code=202)
+async def submit_job(request: PipelineRequest, jobs: JobManager = Depends(get_job_manager)):
+    """Queue a pipeline run and return its id straight away; poll /jobs/{id} for progress."""
+    _validated_skip(request)
+    try:
+        job_id = jobs.submit(request.model_dump())
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=f"Too many pipeline jobs queued ({e}), try again later")
+    return {"job_id": job_id, "status": "queued"}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str, jobs: JobManager = Depends(get_job_manager)):
+    job = jobs.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_status(job)
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str, jobs: JobManager = Depends(get_job_manager)):
+    job = jobs.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    return job["result"]
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str, jobs: JobManager = Depends(get_job_manager)):
+    job = jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_status(job)
+
 
 
 #   uvicorn leadflow_ai.api.main:app --reload
@@ -66,22 +155,16 @@ async def run_leadflow_pipeline(request: PipelineRequest):
 
 if __name__ == "__main__":
     state = AppState(search_query="technology companies in South Loop Chicago", max_links=10)
-    builder = StateGraph(AppState)
-    builder.add_node("scrape_google_maps_node", scrape_google_maps_node)
-    builder.add_node("update_business_emails", update_business_emails)
-    builder.set_entry_point("scrape_google_maps_node")
-    builder.add_edge("scrape_google_maps_node", "update_business_emails")
-    builder.add_node("summarize_business", summarize_business)
-    builder.add_edge("update_business_emails", "summarize_business")
-    builder.add_node("generate_outreach_email", generate_outreach_email_node)
-    builder.add_edge("summarize_business", "generate_outreach_email")
-    builder.add_edge("generate_outreach_email", END)
-
-    # builder.add_edge("update_business_emails", END)
-    graph = builder.compile()
+
+    async def run():
+        try:
+            return await run_pipeline(state)
+        finally:
+            await close_browser_pool()
+            await close_http_client()
 
     # Run the graph
-    results = asyncio.run(graph.ainvoke(state))
+    results = asyncio.run(run())
     
     logging.info(f"Results: {results}")
    
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends, Request
 from pydantic import BaseModel
 from ..services.hunter import get_contacts
-from ..db.supabase import create_supabase, insert_lead, insert_local_target
-from ..services.enrichment import enrich_target
+from ..db.batch_writer import BatchWriter
+from ..db.targets import TargetIndex
+from ..services.geo import target_key
+from ..services.enrichment import enrich_target, ENRICH_CONCURRENCY
+from ..services.geocode import geocode
+from ..services.overpass import search_elements
 import asyncio
-import aiohttp
+import httpx
 import os
 from dotenv import load_dotenv
 import logging
@@ -34,59 +38,67 @@ class Lead(BaseModel):
 # Initialize the router
 router = APIRouter()
 
+# Buffered Supabase writers, started and flushed by the app lifespan
+def get_target_writer(request: Request) -> BatchWriter:
+    return request.app.state.target_writer
+
+def get_lead_writer(request: Request) -> BatchWriter:
+    return request.app.state.lead_writer
+
+def get_target_index(request: Request) -> TargetIndex:
+    return request.app.state.target_index
+
 # Define the POST endpoint
 @router.post("/discover")
-async def discover_location(request: DiscoverRequest):
-    # Step 1: Geocode using Nominatim
-    nominatim_url = f"https://nominatim.openstreetmap.org/search?q={request.location}&format=json"
+async def discover_location(request: DiscoverRequest, target_writer: BatchWriter = Depends(get_target_writer),
+                            target_index: TargetIndex = Depends(get_target_index)):
+    # Step 1: Geocode using Nominatim (through the local geocode cache)
     headers = {"User-Agent": os.getenv("USER_AGENT", "my-app")}
-    async with aiohttp.ClientSession() as session:
-        async with session.get(nominatim_url, headers=headers) as response:
-            if response.status != 200:
-                raise HTTPException(status_code=500, detail="Error accessing Nominatim API")
-            geocode_data = await response.json()
-            if not geocode_data:
-                raise HTTPException(status_code=404, detail="Location not found")
-            lat = geocode_data[0]['lat']
-            lon = geocode_data[0]['lon']
-            logging.debug(f'Geocoded lat/lon: {lat}, {lon}')
-
-    # Step 2: Query Overpass API
+    try:
+        point = await geocode(request.location)
+    except httpx.HTTPError:
+        raise HTTPException(status_code=500, detail="Error accessing Nominatim API")
+    if point is None:
+        raise HTTPException(status_code=404, detail="Location not found")
+    lat, lon = point
+    logging.debug(f'Geocoded lat/lon: {lat}, {lon}')
+
+    # Step 2: Query Overpass API, served from cached tiles where possible
     radius_m = request.radius * 1609.34
-    overpass_query = f"""
-    [out:json][timeout:25];
-    (
-      node[\"office\"](around:{radius_m},{lat},{lon});
-      node[\"amenity\"=\"coworking_space\"](around:{radius_m},{lat},{lon});
-      way[\"building\"=\"apartments\"](around:{radius_m},{lat},{lon});
-      way[\"amenity\"=\"coworking_space\"](around:{radius_m},{lat},{lon});
-      way[\"hotel\"=\"hotel\"](around:{radius_m},{lat},{lon});
-    );
-    out center;
-    """
-    overpass_url = "https://overpass-api.de/api/interpreter"
-    async with aiohttp.ClientSession() as session:
-        async with session.post(overpass_url, data=overpass_query, headers=headers) as response:
-            if response.status != 200:
-                raise HTTPException(status_code=500, detail="Error accessing Overpass API")
-            overpass_data = await response.json()
-
-    # Step 3: Normalize the response
-    results = []
-    for element in overpass_data['elements']:
+    try:
+        elements = await search_elements(lat, lon, radius_m, headers=headers)
+    except httpx.HTTPError:
+        raise HTTPException(status_code=500, detail="Error accessing Overpass API")
+
+    # Step 3: Normalize the response, keyed by a stable id so repeats collapse
+    targets = {}
+    for element in elements:
         name = element.get('tags', {}).get('name', 'Unknown')
         address = element.get('tags', {}).get('addr:full', 'Unknown')
         lat = element.get('lat', element.get('center', {}).get('lat', 0))
         lon = element.get('lon', element.get('center', {}).get('lon', 0))
         if lat and lon:
-            target = {
+            targets.setdefault(target_key(name, lat, lon), {
                 "name": name,
                 "type": element.get('tags', {}).get('amenity', 'office'),
                 "address": address,
                 "lat": lat,
                 "lng": lon,
                 "source": "overpass"
-            }
+            })
+
+    # Targets stored by an earlier discovery are returned as stored, without enriching them again
+    await target_index.load()
+    known = await target_index.fetch([key for key in targets if key in target_index])
+    logging.info(f"{len(known)} of {len(targets)} targets already known")
+
+    # Step 4: Enrich and store the new targets concurrently; each upstream keeps its own rate limit
+    enrich_limit = asyncio.Semaphore(ENRICH_CONCURRENCY)
+
+    async def enrich_and_store(key: int, target: dict) -> dict:
+        if key in known:
+            return known[key]
+        async with enrich_limit:
             # Log the target before enrichment
             logging.info(f"Enriching target: {target}")
             try:
@@ -96,49 +108,74 @@ async def discover_location(request: DiscoverRequest):
                 logging.warning(f"Enrichment failed, using fallback address: {e}")
                 enriched_target = target  # fallback to original
 
-            # Log enriched data before insert
-            logging.info(f"Inserting enriched target: {enriched_target}")
-
-            # Insert enriched data into Supabase
-            supabase = await create_supabase()
-            await insert_local_target(supabase, {
-                "name": enriched_target['name'],
-                "address": enriched_target['address'],
-                "lat": enriched_target['lat'],
-                "lng": enriched_target['lng'],
-                "type": enriched_target['type'],
-                "source": enriched_target['source'],
-                "unique_hash": hash((enriched_target['name'], enriched_target['lat'], enriched_target['lng']))
-            })
-
-            results.append(enriched_target)
+        # Log enriched data before insert
+        logging.info(f"Inserting enriched target: {enriched_target}")
+        # Queue one upsert per target; the writer sends them to Supabase in bulk
+        await target_writer.add({
+            "name": enriched_target['name'],
+            "address": enriched_target['address'],
+            "lat": enriched_target['lat'],
+            "lng": enriched_target['lng'],
+            "type": enriched_target['type'],
+            "source": enriched_target['source'],
+            "domain": enriched_target.get('domain'),
+            "website": enriched_target.get('website'),
+            "unique_hash": key
+        })
+        target_index.add(key)
+        return enriched_target
+
+    # gather keeps the Overpass order
+    results = await asyncio.gather(*(enrich_and_store(key, target) for key, target in targets.items()))
 
     # Step 5: Return the results as JSON
     return results
 
+def _lead_rows(lead: Lead, contacts: list[dict]) -> list[dict]:
+    return [{
+        "name": contact['full_name'],
+        "email": contact['email'],
+        "position": contact['position'],
+        "confidence": contact['confidence'],
+        "domain": lead.domain,
+        "zip": lead.zip,
+        "interests": lead.interests
+    } for contact in contacts]
+
 # Define the POST endpoint
 @router.post("/ingest-lead")
-async def ingest_lead(lead: Lead):
+async def ingest_lead(lead: Lead, lead_writer: BatchWriter = Depends(get_lead_writer)):
     # Use Hunter.io to find contacts
-    contacts = get_contacts(lead.domain)
+    contacts = await get_contacts(lead.domain)
     if not contacts:
         raise HTTPException(status_code=404, detail="No contacts found")
 
-    # Connect to Supabase
-    supabase = await create_supabase()
-
-    # Insert contacts into Supabase
-    for contact in contacts:
-        lead_data = {
-            "name": contact['full_name'],
-            "email": contact['email'],
-            "position": contact['position'],
-            "confidence": contact['confidence'],
-            "domain": lead.domain,
-            "zip": lead.zip,
-            "interests": lead.interests
-        }
-        await insert_lead(supabase, lead_data)
+    # Insert contacts into Supabase (buffered, written in bulk)
+    for lead_data in _lead_rows(lead, contacts):
+        await lead_writer.add(lead_data)
 
     # Return a success message
-    return {"message": "Leads ingested successfully", "matched_business": lead.domain} 
\ No newline at end of file
+    return {"message": "Leads ingested successfully", "matched_business": lead.domain}
+
+class BulkLeadRequest(BaseModel):
+    leads: list[Lead]
+
+@router.post("/ingest-leads")
+async def ingest_leads(request: BulkLeadRequest, lead_writer: BatchWriter = Depends(get_lead_writer)):
+    """Resolve many leads concurrently; Hunter's rate limit and per-domain cache are shared across them."""
+    async def resolve(lead: Lead) -> dict:
+        try:
+            contacts = await get_contacts(lead.domain)
+        except Exception as e:
+            logging.warning(f"Hunter lookup failed for {lead.domain}: {e}")
+            return {"domain": lead.domain, "contacts": 0, "error": str(e)}
+        for lead_data in _lead_rows(lead, contacts):
+            await lead_writer.add(lead_data)
+        return {"domain": lead.domain, "contacts": len(contacts)}
+
+    results = await asyncio.gather(*(resolve(lead) for lead in request.leads))
+    return {
+        "matched_businesses": sum(1 for result in results if result["contacts"]),
+        "contacts": sum(result["contacts"] for result in results),
+        "results": results,
+    }
@@ -0,0 +1,51 @@
+"""
+Per-business page latency: fresh Chromium per page (the old behaviour) vs. a
+leased page from the shared BrowserPool.
+
+    python -m leadflow_ai.bench_browser_pool https://example.com 10
+"""
+import sys
+import time
+import asyncio
+import statistics
+from playwright.async_api import async_playwright
+from leadflow_ai.services.browser_pool import get_browser_pool, close_browser_pool
+
+
+async def load_cold(url: str) -> float:
+    start = time.perf_counter()
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        await page.goto(url, timeout=20000)
+        await page.content()
+        await browser.close()
+    return time.perf_counter() - start
+
+
+async def load_pooled(url: str) -> float:
+    start = time.perf_counter()
+    async with get_browser_pool().lease() as page:
+        await page.goto(url, timeout=20000)
+        await page.content()
+    return time.perf_counter() - start
+
+
+def report(label: str, timings: list[float]):
+    print(f"{label:>8}: mean {statistics.mean(timings):.3f}s  "
+          f"p50 {statistics.median(timings):.3f}s  max {max(timings):.3f}s  (n={len(timings)})")
+
+
+async def main(url: str, runs: int):
+    cold = [await load_cold(url) for _ in range(runs)]
+    pooled = [await load_pooled(url) for _ in range(runs)]
+    print(f"Pool stats: {get_browser_pool().stats()}")
+    await close_browser_pool()
+    report("cold", cold)
+    report("pooled", pooled)
+
+
+if __name__ == "__main__":
+    url = sys.argv[1] if len(sys.argv) > 1 else "https://example.com"
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    asyncio.run(main(url, runs))
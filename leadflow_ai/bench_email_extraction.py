@@ -0,0 +1,110 @@
+"""
+Email extraction and scoring over a corpus of saved pages: the old per-email
+scans (regex over raw HTML, separate mailto pass, repeated substring searches
+of the visible text per email) vs. the single-pass engine in
+services/email_extract.py. Parsing is done up front for both, so only
+extraction and scoring are timed.
+
+    python -m leadflow_ai.bench_email_extraction path/to/saved_pages/   # *.html
+    python -m leadflow_ai.bench_email_extraction                       # synthetic corpus
+"""
+import re
+import sys
+import time
+import random
+from pathlib import Path
+from leadflow_ai.services.page_store import PageContent
+from leadflow_ai.services.email_extract import score_emails, FORBIDDEN_EMAIL_PATTERNS
+
+
+def old_score_emails(page: PageContent) -> dict[str, int]:
+    def is_valid_email(email):
+        if not email or "@" not in email:
+            return False
+        if any(bad in email.lower() for bad in FORBIDDEN_EMAIL_PATTERNS):
+            return False
+        return re.match(r"^[\w\.-]+@[\w\.-]+\.\w+$", email) is not None
+
+    def smart_score_email(email, visible_text, footer_text):
+        s = 0
+        if "info@" in email or "contact@" in email or "support@" in email:
+            s += 10
+        if email.lower() in visible_text:
+            s += 5
+        if footer_text and email.lower() in footer_text:
+            s += 5
+        idx = visible_text.find(email.lower())
+        if idx != -1:
+            window = visible_text[max(0, idx - 40):idx + 40]
+            if any(w in window for w in ["contact", "inquir", "media", "reach us", "email us"]):
+                s += 5
+        if "dev@" in email or "agency" in email or "webmaster@" in email:
+            s -= 5
+        return s
+
+    visible_text, footer_text = page.visible_text.lower(), page.footer_text.lower()
+    scores = {}
+    for a in page.soup.find_all("a", href=True):
+        if a["href"].startswith("mailto:"):
+            email = a["href"].replace("mailto:", "").strip()
+            scores[email] = smart_score_email(email, visible_text, footer_text)
+    for email in set(re.findall(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", page.html)):
+        if is_valid_email(email):
+            scores[email] = smart_score_email(email, visible_text, footer_text)
+    return scores
+
+
+def synthetic_page(rng: random.Random, i: int) -> str:
+    domain = f"business{i}.com"
+    paragraphs = []
+    for j in range(400):
+        words = " ".join(rng.choice(["services", "quality", "team", "local", "trusted", "family", "since",
+                                     "years", "customers", "office", "hours", "call", "today"]) for _ in range(25))
+        if j % 50 == 0:
+            words += f" reach us at sales{j}@{domain} or info [at] {domain.replace('.', ' [dot] ')}"
+        paragraphs.append(f"<div class='section'><div class='row'><p>{words}</p></div></div>")
+    scripts = "".join(f"<script src='https://cdn.example.net/lib{j}.js'></script>" for j in range(20))
+    return (f"<html><head>{scripts}<style>.a{{color:red}}</style></head><body>"
+            f"<nav><a href='/contact'>Contact</a><a href='/about'>About</a></nav>{''.join(paragraphs)}"
+            f"<footer>Contact us: <a href='mailto:contact@{domain}'>contact@{domain}</a> "
+            f"webmaster&#64;{domain} <a href='/cdn-cgi/l/email-protection#{encode_cf('support@' + domain)}'>"
+            f"[email&#160;protected]</a></footer></body></html>")
+
+
+def encode_cf(email: str, key: int = 0x42) -> str:
+    return f"{key:02x}" + "".join(f"{ord(c) ^ key:02x}" for c in email)
+
+
+def load_corpus(directory: str | None) -> list[str]:
+    if directory:
+        return [path.read_text(errors="ignore") for path in sorted(Path(directory).glob("*.html"))]
+    rng = random.Random(0)
+    return [synthetic_page(rng, i) for i in range(100)]
+
+
+def best(scores: dict[str, int]) -> str | None:
+    return max(scores, key=scores.get) if scores else None
+
+
+def main(directory: str | None):
+    pages = [PageContent(url=f"page{i}", html=html) for i, html in enumerate(load_corpus(directory))]
+    for page in pages:
+        page.visible_text, page.footer_text  # parse once, outside the timings
+    print(f"{len(pages)} pages, {sum(len(p.html) for p in pages) / len(pages) / 1024:.0f} KB average")
+
+    results = {}
+    for label, scorer in (("old", old_score_emails), ("single pass", score_emails)):
+        start = time.perf_counter()
+        results[label] = [scorer(page) for page in pages]
+        elapsed = time.perf_counter() - start
+        found = sum(1 for scores in results[label] if scores)
+        candidates = sum(len(scores) for scores in results[label])
+        print(f"{label:>12}: {elapsed / len(pages) * 1000:7.2f}ms/page, "
+              f"{candidates} candidates, an email on {found} pages")
+    same = sum(1 for old, new in zip(results["old"], results["single pass"])
+               if (best(old) or "").lower() == (best(new) or ""))
+    print(f"same best email on {same}/{len(pages)} pages")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,132 @@
+"""
+Parse time and peak memory of the summarizer's text extraction on large
+pages: the old get_text()-per-candidate extractor on html.parser vs. the
+single-pass TextIndex extractor (services/html_parser.py) on html.parser and,
+when installed, on lxml. Also checks the extracted text is unchanged.
+
+    python -m leadflow_ai.bench_html_parsing path/to/saved_pages/   # *.html
+    python -m leadflow_ai.bench_html_parsing                       # synthetic corpus
+
+Peak memory is what tracemalloc sees, i.e. the Python objects of the tree;
+lxml's own C buffers are freed once BeautifulSoup has built it.
+"""
+import re
+import sys
+import time
+import random
+import tracemalloc
+from pathlib import Path
+from bs4 import BeautifulSoup
+from leadflow_ai.services import html_parser
+from leadflow_ai.services.summirize_business_and_pain_points import extract_business_relevant_text
+
+
+def old_extract_business_relevant_text(html: str, min_len: int = 40) -> str:
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "noscript", "iframe", "svg", "footer", "nav", "form", "aside"]):
+        tag.decompose()
+    sections = []
+    headings = soup.find_all(["h1", "h2", "h3"])
+    sections += [h.get_text(" ", strip=True) for h in headings if h.get_text(strip=True)]
+    keywords = re.compile(r'(about|service|what[\s\-]?we[\s\-]?do|company|solution)', re.I)
+    special_sections = soup.find_all(
+        lambda tag: (
+            (tag.name in ["section", "div"]) and
+            (tag.get("id") and keywords.search(tag.get("id"))) or
+            (tag.get("class") and any(keywords.search(c) for c in tag.get("class")))
+        )
+    )
+    for s in special_sections:
+        text = s.get_text(" ", strip=True)
+        if len(text) > min_len:
+            sections.append(text)
+    main = soup.find("main")
+    if main:
+        main_text = main.get_text(" ", strip=True)
+        if len(main_text) > min_len:
+            sections.append(main_text)
+    else:
+        candidates = [block.get_text(" ", strip=True) for block in soup.find_all("div") if block.get_text(strip=True)]
+        if candidates:
+            candidates = sorted(candidates, key=len, reverse=True)
+            if len(candidates[0]) > min_len:
+                sections.append(candidates[0])
+    seen = set()
+    final = []
+    for s in sections:
+        s_norm = s[:100]
+        if s_norm not in seen and len(s) > min_len:
+            final.append(s)
+            seen.add(s_norm)
+    text = "\n\n".join(final)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text.strip()
+
+
+def synthetic_page(rng: random.Random, i: int) -> str:
+    """A page builder's output: content wrapped in many nested layout divs, no <main>."""
+    words = ["services", "quality", "team", "local", "trusted", "family", "since", "years",
+             "customers", "office", "hours", "call", "today", "solutions", "about"]
+    blocks = []
+    for j in range(60):
+        paragraphs = "".join(f"<p>{' '.join(rng.choice(words) for _ in range(40))}</p>" for _ in range(8))
+        css = "service-block" if j % 10 == 0 else "elementor-widget"
+        blocks.append(f"<h2>Section {j} of business {i}</h2><div class='{css}'>{paragraphs}</div>")
+    body = "".join(blocks)
+    for depth in range(40):
+        body = f"<div class='wrap-{depth}'>{body}</div>"
+    scripts = "".join(f"<script>var config{j} = {{a: {j}}};</script>" for j in range(30))
+    return (f"<html><head>{scripts}<style>.a{{color:red}}</style></head><body>"
+            f"<nav><a href='/contact'>Contact</a></nav><h1>Business {i}</h1>{body}"
+            f"<footer>Copyright business {i}</footer></body></html>")
+
+
+def load_corpus(directory: str | None) -> list[str]:
+    if directory:
+        return [path.read_text(errors="ignore") for path in sorted(Path(directory).glob("*.html"))]
+    rng = random.Random(0)
+    return [synthetic_page(rng, i) for i in range(20)]
+
+
+def use_parser(name: str):
+    html_parser.HTML_PARSER = name
+    html_parser.parser_name.cache_clear()
+
+
+def measure(extract, pages: list[str]) -> tuple[float, float, list[str]]:
+    """Seconds per page, peak MB over any single page, and the outputs."""
+    outputs, peak, start = [], 0, time.perf_counter()
+    for html in pages:
+        outputs.append(extract(html))
+    elapsed = time.perf_counter() - start
+    for html in pages:
+        tracemalloc.start()
+        extract(html)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return elapsed / len(pages), peak / 2 ** 20, outputs
+
+
+def main(directory: str | None):
+    pages = load_corpus(directory)
+    print(f"{len(pages)} pages, {sum(len(p) for p in pages) / len(pages) / 1024:.0f} KB average")
+
+    configured = html_parser.HTML_PARSER
+    runs = [("old, html.parser", None, old_extract_business_relevant_text),
+            ("new, html.parser", "html.parser", extract_business_relevant_text)]
+    if html_parser._installed("lxml"):
+        runs.append(("new, lxml", "lxml", extract_business_relevant_text))
+    baseline = None
+    for label, parser, extract in runs:
+        if parser:
+            use_parser(parser)
+        seconds, peak_mb, outputs = measure(extract, pages)
+        baseline = baseline or outputs
+        same = sum(1 for old, new in zip(baseline, outputs) if old == new)
+        print(f"{label:>18}: {seconds * 1000:8.1f}ms/page, peak {peak_mb:6.1f}MB, "
+              f"same text on {same}/{len(pages)} pages")
+    use_parser(configured)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
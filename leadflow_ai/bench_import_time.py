@@ -0,0 +1,99 @@
+"""
+Cold start of the API and the Streamlit UI against a time budget. Each target
+starts in a fresh interpreter; the best of ``runs`` is compared with its
+budget, and the slowest imports come from ``python -X importtime``. Exits 1
+when a target is over budget, so it can gate CI.
+
+    python -m leadflow_ai.bench_import_time          # 3 runs each
+    python -m leadflow_ai.bench_import_time 5
+
+API start = importing leadflow_ai.api.main plus the FastAPI lifespan startup
+(pipeline compile, job manager, writers). UI start = running the Streamlit
+script once in bare mode, i.e. its imports and top-level code.
+"""
+import os
+import sys
+import json
+import subprocess
+
+# Seconds; override with COLD_START_BUDGET_API / COLD_START_BUDGET_UI
+BUDGETS = {
+    "api": float(os.getenv("COLD_START_BUDGET_API", "2.5")),
+    "ui": float(os.getenv("COLD_START_BUDGET_UI", "2.0")),
+}
+
+TARGETS = {
+    "api": ("leadflow_ai.api.main", """
+import time, json
+start = time.perf_counter()
+import leadflow_ai.api.main as main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(main.app):
+    ready = time.perf_counter()
+from leadflow_ai.services import providers
+print(json.dumps({"import": imported - start, "start": ready - start,
+                  "chat_models": providers.chat_model.cache_info().currsize,
+                  "openai_clients": providers.openai_client.cache_info().currsize}))
+"""),
+    "ui": ("leadflow_ai.leadflow_ui", """
+import time, json
+start = time.perf_counter()
+import leadflow_ai.leadflow_ui
+imported = time.perf_counter()
+print(json.dumps({"import": imported - start, "start": imported - start}))
+"""),
+}
+
+
+def run(code: str, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args, "-c", code], capture_output=True, text=True,
+                          env={**os.environ, "PYTHONWARNINGS": "ignore"})
+
+
+def slowest_imports(module: str, top: int = 8) -> list[tuple[float, str]]:
+    """The target's direct imports by cumulative time, from -X importtime."""
+    stderr = run(f"import {module}", "-X", "importtime").stderr
+    rows, depth = [], None
+    for line in reversed(stderr.splitlines()):
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        indent = len(name) - len(name.lstrip())
+        if name.strip() == module:
+            depth = indent + 2
+        elif depth is not None and indent == depth and cumulative.strip().isdigit():
+            rows.append((int(cumulative) / 1e6, name.strip()))
+        elif depth is not None and indent < depth:
+            break
+    return sorted(rows, reverse=True)[:top]
+
+
+def main(runs: int) -> int:
+    over = 0
+    for target, (module, code) in TARGETS.items():
+        results = []
+        for _ in range(runs):
+            proc = run(code)
+            if proc.returncode != 0:
+                print(f"{target}: failed to start\n{proc.stderr.strip().splitlines()[-1]}")
+                break
+            results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+        if not results:
+            continue
+        best = min(results, key=lambda result: result["start"])
+        budget = BUDGETS[target]
+        status = "ok" if best["start"] <= budget else "OVER BUDGET"
+        over += best["start"] > budget
+        print(f"{target}: import {best['import']:.2f}s, start {best['start']:.2f}s "
+              f"(budget {budget:.1f}s) {status}")
+        if "chat_models" in best:
+            print(f"  clients created at startup: {best['chat_models']} chat models, "
+                  f"{best['openai_clients']} OpenAI clients")
+        for seconds, name in slowest_imports(module):
+            print(f"  {seconds:6.2f}s  {name}")
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 3))
@@ -0,0 +1,78 @@
+"""
+Upstream Overpass calls for a discovery sweep across a city: one radius query
+per /discover call (the old behaviour) vs. assembling circles from cached
+geohash tiles. Overpass is replaced by a local stand-in that returns a few
+synthetic offices per bbox, so no network access is needed.
+
+    python -m leadflow_ai.bench_overpass_tiles 5 1.0
+"""
+import os
+import re
+import sys
+import json
+import asyncio
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Keep the benchmark's tiles out of the real cache
+os.environ["LEADFLOW_CACHE_DIR"] = tempfile.mkdtemp(prefix="bench_overpass_")
+
+from leadflow_ai.services import overpass
+from leadflow_ai.services.http_client import close_http_client
+
+BBOX = re.compile(r"\(([-\d.]+),([-\d.]+),([-\d.]+),([-\d.]+)\);")
+
+
+class StandIn(BaseHTTPRequestHandler):
+    calls = 0
+
+    def do_POST(self):
+        query = self.rfile.read(int(self.headers["Content-Length"])).decode()
+        StandIn.calls += 1
+        elements = []
+        for south, west, north, east in {m.groups() for m in BBOX.finditer(query)}:
+            south, west, north, east = map(float, (south, west, north, east))
+            for i in range(4):
+                lat, lon = south + (north - south) * (i + 0.5) / 4, west + (east - west) * (i + 0.5) / 4
+                elements.append({"type": "node", "id": hash((round(lat, 6), round(lon, 6))), "lat": lat, "lon": lon,
+                                 "tags": {"office": "company", "name": f"Office {lat:.4f},{lon:.4f}"}})
+        body = json.dumps({"elements": elements}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def main(grid: int, radius_miles: float):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    overpass.OVERPASS_URL = f"http://127.0.0.1:{server.server_port}"
+    radius_m = radius_miles * 1609.34
+    # Circles one radius apart, so neighbouring sweeps overlap heavily
+    step = radius_m / 111320
+    centers = [(41.85 + i * step, -87.68 + j * step * 1.34) for i in range(grid) for j in range(grid)]
+    found = 0
+    try:
+        for lat, lng in centers:
+            found += len(await overpass.search_elements(lat, lng, radius_m))
+        # Re-running the same sweep later should be free
+        calls_first = StandIn.calls
+        for lat, lng in centers:
+            await overpass.search_elements(lat, lng, radius_m)
+    finally:
+        await close_http_client()
+        server.shutdown()
+    print(f"{len(centers)} overlapping /discover calls, radius {radius_miles} mi, {found} elements returned")
+    print(f"{'radius query':>14}: {len(centers):4d} upstream calls")
+    print(f"{'cached tiles':>14}: {calls_first:4d} upstream calls, {StandIn.calls - calls_first} on a repeat sweep")
+
+
+if __name__ == "__main__":
+    grid = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    radius = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    asyncio.run(main(grid, radius))
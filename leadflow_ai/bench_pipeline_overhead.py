@@ -0,0 +1,53 @@
+"""
+Per-request pipeline overhead under concurrent load: building and compiling the
+LangGraph on every request (the old behaviour) vs. reusing the graph compiled
+once by get_pipeline. Stages are replaced with no-ops so only the framework
+overhead is measured; no network access is needed.
+
+    python -m leadflow_ai.bench_pipeline_overhead 500 50
+"""
+import sys
+import time
+import asyncio
+import statistics
+from leadflow_ai.agents import pipeline
+from leadflow_ai.schemas.lead import AppState
+
+
+async def noop_stage(state: AppState) -> dict:
+    return {"businesses": state.businesses}
+
+
+async def measure(label: str, make_graph, requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one_request(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            graph = make_graph()
+            await graph.ainvoke(AppState(search_query=f"bench {i}", max_links=10))
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_request(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"{label:>18}: {requests / elapsed:8.1f} req/s  "
+          f"p50 {statistics.median(latencies) * 1000:7.2f}ms  "
+          f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:7.2f}ms")
+
+
+async def main(requests: int, concurrency: int):
+    pipeline.STAGES = {name: noop_stage for name in pipeline.STAGES}
+    pipeline.get_pipeline.cache_clear()
+    stages = pipeline.resolve_stages()
+    print(f"{requests} requests, {concurrency} concurrent")
+    await measure("compile per call", lambda: pipeline.build_pipeline(stages), requests, concurrency)
+    await measure("compiled once", lambda: pipeline.get_pipeline(stages), requests, concurrency)
+
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    asyncio.run(main(requests, concurrency))
@@ -0,0 +1,48 @@
+"""
+Bytes received and load time per navigation for one stage, loading every URL
+with resource blocking off (the old behaviour) and then on. Pages are loaded
+straight from the pool, bypassing the page cache.
+
+    python -m leadflow_ai.bench_resource_blocking website https://example.com https://example.org
+    python -m leadflow_ai.bench_resource_blocking maps "https://www.google.com/maps/search/coworking+austin"
+"""
+import sys
+import asyncio
+from leadflow_ai.services import resource_policy
+from leadflow_ai.services.browser_pool import get_browser_pool, close_browser_pool
+from leadflow_ai.services.readiness import wait_for_ready
+
+
+async def load(stage: str, url: str):
+    async with get_browser_pool().lease(stage=stage) as page:
+        with resource_policy.measure_load(stage):
+            await page.goto(url, timeout=30000)
+            await wait_for_ready(page, ceiling_ms=2000)
+        await page.content()
+
+
+async def main(stage: str, urls: list[str]):
+    results = {}
+    for blocking in (False, True):
+        resource_policy.RESOURCE_BLOCKING = blocking
+        resource_policy.reset_resource_stats()
+        for url in urls:
+            try:
+                await load(stage, url)
+            except Exception as e:
+                print(f"{url}: {e}")
+        results[blocking] = resource_policy.resource_stats().get(stage, {})
+    await close_browser_pool()
+
+    print(f"stage {stage!r}, allowed: {sorted(resource_policy.allowed_types(stage) or ['*'])}")
+    for blocking, stats in results.items():
+        print(f"{'blocking' if blocking else 'no blocking':>12}: "
+              f"{stats.get('bytes_per_navigation', 0) / 1024:8.0f} KB/nav  "
+              f"{stats.get('ms_per_navigation', 0):6d} ms/nav  "
+              f"{stats.get('requests', 0)} requests, {stats.get('blocked', 0)} blocked")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        sys.exit(__doc__)
+    asyncio.run(main(sys.argv[1], sys.argv[2:]))
@@ -0,0 +1,90 @@
+import os
+import asyncio
+import logging
+import httpx
+from dotenv import load_dotenv
+from postgrest.types import ReturnMethod
+from leadflow_ai.db.supabase import get_supabase
+
+load_dotenv()
+
+# Rows buffered per table before a bulk write, and the longest a row waits
+SUPABASE_BATCH_SIZE = int(os.getenv("SUPABASE_BATCH_SIZE", "100"))
+SUPABASE_FLUSH_INTERVAL = float(os.getenv("SUPABASE_FLUSH_INTERVAL", "1.0"))
+
+
+class BatchWriter:
+    """
+    Buffers rows for one Supabase table and writes them in bulk, one request per
+    batch: as soon as ``max_batch`` rows are waiting, otherwise every
+    ``flush_interval`` seconds. With ``on_conflict`` rows are upserted on that
+    column instead of inserted.
+
+    Rows still buffered are written by ``close``. A batch that fails on the
+    network is kept for the next flush; one the database rejects is logged and
+    dropped.
+    """
+
+    def __init__(self, table: str, on_conflict: str | None = None, max_batch: int = SUPABASE_BATCH_SIZE,
+                 flush_interval: float = SUPABASE_FLUSH_INTERVAL, client_factory=get_supabase):
+        self.table = table
+        self.on_conflict = on_conflict
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.client_factory = client_factory
+        self.rows: list[dict] = []
+        self.round_trips = 0
+        self.rows_written = 0
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._flush_periodically())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    async def add(self, row: dict):
+        self.rows.append(row)
+        if len(self.rows) >= self.max_batch:
+            await self.flush()
+
+    async def flush(self):
+        async with self._lock:
+            while self.rows:
+                batch, self.rows = self.rows[:self.max_batch], self.rows[self.max_batch:]
+                if not await self._write(batch):
+                    return
+
+    async def _write(self, batch: list[dict]) -> bool:
+        if self.on_conflict:
+            # Postgres refuses to upsert the same row twice in one statement; keep the latest
+            batch = list({row[self.on_conflict]: row for row in batch}.values())
+        try:
+            supabase = await self.client_factory()
+            table = supabase.table(self.table)
+            if self.on_conflict:
+                query = table.upsert(batch, on_conflict=self.on_conflict, returning=ReturnMethod.minimal)
+            else:
+                query = table.insert(batch, returning=ReturnMethod.minimal)
+            self.round_trips += 1
+            await query.execute()
+        except httpx.TransportError as e:
+            logging.warning(f"⚠️ Writing {len(batch)} rows to {self.table} failed, retrying on next flush: {e}")
+            self.rows[:0] = batch
+            return False
+        except Exception as e:
+            logging.error(f"❌ Dropping {len(batch)} rows for {self.table}: {e}")
+            return True
+        self.rows_written += len(batch)
+        logging.info(f"Wrote {len(batch)} rows to {self.table}")
+        return True
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
@@ -1,39 +1,42 @@
 import os
 from dotenv import load_dotenv
-from pinecone import Pinecone, ServerlessSpec
-from openai import OpenAI
 from typing import List, Dict
+from leadflow_ai.services.providers import Lazy, openai_client
 
 load_dotenv()
 
 PINECONE_API_KEY = os.getenv('PINECONE_API_KEY')
-OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
-
-# Create an instance of the Pinecone class
-pc = Pinecone(api_key=PINECONE_API_KEY)
 
 index_name = 'leads'
 
-# Ensure the index exists
-if index_name not in pc.list_indexes().names():
-    pc.create_index(
-        name=index_name,
-        dimension=1536,  # Correct dimension for text-embedding-3-small
-        metric='cosine',  # or 'euclidean', depending on your use case
-        spec=ServerlessSpec(
-            cloud='aws',
-            region='us-east-1'  # Change to a valid AWS region
+
+def _connect_index():
+    from pinecone import Pinecone, ServerlessSpec
+
+    # Create an instance of the Pinecone class
+    pc = Pinecone(api_key=PINECONE_API_KEY)
+
+    # Ensure the index exists
+    if index_name not in pc.list_indexes().names():
+        pc.create_index(
+            name=index_name,
+            dimension=1536,  # Correct dimension for text-embedding-3-small
+            metric='cosine',  # or 'euclidean', depending on your use case
+            spec=ServerlessSpec(
+                cloud='aws',
+                region='us-east-1'  # Change to a valid AWS region
+            )
         )
-    )
 
-# Use the Index method from the Pinecone instance
-index = pc.Index(index_name)
+    # Use the Index method from the Pinecone instance
+    return pc.Index(index_name)
+
 
-# Initialize OpenAI client
-client = OpenAI(api_key=OPENAI_API_KEY)
+# Connected (and created if missing) on first use rather than at import
+index = Lazy(_connect_index, "pinecone index")
 
 def get_embedding(text: str, model: str = "text-embedding-3-small") -> List[float]:
-    response = client.embeddings.create(input=[text], model=model)
+    response = openai_client().embeddings.create(input=[text], model=model)
     return response.data[0].embedding
 
 async def embed_interests(interests: List[str]) -> List[float]:
@@ -43,9 +46,9 @@ async def embed_interests(interests: List[str]) -> List[float]:
 
 async def upsert_lead(lead_id: str, interests: List[str]):
     embedding = await embed_interests(interests)
-    index.upsert([(lead_id, embedding)])
+    index.get().upsert([(lead_id, embedding)])
 
 async def search_businesses(query_interests: List[str], top_k: int = 5) -> List[Dict]:
     query_embedding = await embed_interests(query_interests)
-    results = index.query(vector=query_embedding, top_k=top_k, include_values=True)
+    results = index.get().query(vector=query_embedding, top_k=top_k, include_values=True)
     return results
\ No newline at end of file
@@ -1,4 +1,5 @@
 import os
+import asyncio
 from supabase._async.client import AsyncClient as Client, create_client
 from dotenv import load_dotenv
 from typing import List
@@ -11,6 +12,17 @@ SUPABASE_KEY = os.getenv('SUPABASE_KEY')
 async def create_supabase() -> Client:
     return await create_client(SUPABASE_URL, SUPABASE_KEY)
 
+_client: Client | None = None
+_client_lock = asyncio.Lock()
+
+async def get_supabase() -> Client:
+    """App-lifetime client, created on first use and shared by every request (usable as a FastAPI dependency)."""
+    global _client
+    async with _client_lock:
+        if _client is None:
+            _client = await create_supabase()
+    return _client
+
 async def insert_lead(supabase: Client, lead_data: dict) -> dict:
     response = await supabase.table('leads').insert(lead_data).execute()
     return response.data
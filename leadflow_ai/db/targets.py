@@ -0,0 +1,66 @@
+import asyncio
+import logging
+from leadflow_ai.db.supabase import get_supabase
+
+TARGET_COLUMNS = "name,address,lat,lng,type,source,domain,website,unique_hash"
+
+
+class TargetIndex:
+    """
+    In-memory set of the ``unique_hash`` keys already in ``local_targets``, so
+    /discover can skip enrichment for places it stored before.
+
+    Seeded from Supabase on first use (keys only, paged) and kept current as
+    targets are queued for writing.
+    """
+
+    def __init__(self, client_factory=get_supabase, page_size: int = 1000):
+        self.client_factory = client_factory
+        self.page_size = page_size
+        self.keys: set[int] = set()
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    def __contains__(self, key: int) -> bool:
+        return key in self.keys
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, key: int):
+        self.keys.add(key)
+
+    async def load(self):
+        async with self._lock:
+            if self._loaded:
+                return
+            try:
+                supabase = await self.client_factory()
+                start = 0
+                while True:
+                    response = await supabase.table("local_targets").select("unique_hash") \
+                        .range(start, start + self.page_size - 1).execute()
+                    self.keys.update(row["unique_hash"] for row in response.data)
+                    if len(response.data) < self.page_size:
+                        break
+                    start += self.page_size
+            except Exception as e:
+                # Retried on the next call; until then every target counts as new
+                logging.warning(f"⚠️ Could not load known targets: {e}")
+                return
+            self._loaded = True
+            logging.info(f"Loaded {len(self.keys)} known targets")
+
+    async def fetch(self, keys: list[int], chunk: int = 200) -> dict[int, dict]:
+        """Stored rows for ``keys`` (without ``unique_hash``), keyed by it; missing keys are left out."""
+        rows = {}
+        try:
+            supabase = await self.client_factory()
+            for i in range(0, len(keys), chunk):
+                response = await supabase.table("local_targets").select(TARGET_COLUMNS) \
+                    .in_("unique_hash", keys[i:i + chunk]).execute()
+                for row in response.data:
+                    rows[row.pop("unique_hash")] = row
+        except Exception as e:
+            logging.warning(f"⚠️ Could not fetch known targets: {e}")
+        return rows
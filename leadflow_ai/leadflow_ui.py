@@ -1,11 +1,10 @@
+import json
 import requests
 import streamlit as st
 import pandas as pd
 import asyncio
 
-# Import your actual pipeline entrypoint and AppState
-from leadflow_ai.schemas.lead import AppState
-from leadflow_ai.api.main import run_leadflow_pipeline  # You may need to adapt this import
+# The pipeline itself runs in the API process (compiled once at startup); the UI talks to it over HTTP
 
 st.set_page_config(page_title="LeadFlow AI - Business Scraper", layout="wide")
 st.title("🚀 LeadFlow AI: Local Business Scraper & Analyzer")
@@ -13,37 +12,73 @@ st.title("🚀 LeadFlow AI: Local Business Scraper & Analyzer")
 st.sidebar.header("🔍 Search Configuration")
 query = st.sidebar.text_input("Google Maps Search Query", value="technology companies in South Loop Chicago")
 max_links = st.sidebar.number_input("Max Businesses", min_value=1, max_value=25, value=10)
+skip_outreach = st.sidebar.checkbox("Skip outreach email generation", value=False)
 run_pipeline = st.sidebar.button("Run LeadFlow Pipeline")
 
-def call_api(query, max_links):
-    url = "http://localhost:8000/run-leadflow-pipeline"
+def stream_api(query, max_links, skip_stages=()):
+    """Yield pipeline events from the NDJSON streaming endpoint as they arrive."""
+    url = "http://localhost:8000/run-leadflow-pipeline/stream"
     payload = {
         "search_query": query,
-        "max_links": int(max_links)
+        "max_links": int(max_links),
+        "skip_stages": list(skip_stages)
     }
-    with st.spinner("⏳ Running pipeline…"):
-        resp = requests.post(url, json=payload)
+    with requests.post(url, json=payload, stream=True) as resp:
         resp.raise_for_status()
-        return resp.json()["businesses"]
+        for line in resp.iter_lines():
+            if line:
+                yield json.loads(line)
+
+def to_dataframe(businesses):
+    return pd.DataFrame([
+        {
+            "Name": b["name"],
+            "Website": b["website"],
+            "Email": b["email"],
+            "Summary": b.get("summary", ""),
+            "Pain Points": b.get("pain_points", ""),
+            "Outreach Email": b.get("outreach_email", ""),
+            "Google Maps": b["url"]
+        }
+        for b in businesses
+    ])
+
+STAGE_LABELS = {
+    "scraped": "scraped",
+    "email": "email found",
+    "summary": "summarized",
+    "outreach": "outreach email written",
+}
 
 if run_pipeline:
     try:
-        businesses = call_api(query, max_links)
+        # Businesses by their position in the Maps results, updated as each stage finishes
+        by_index = {}
+        status = st.empty()
+        live_table = st.empty()
+        with st.spinner("⏳ Running pipeline…"):
+            skip_stages = ["generate_outreach_email"] if skip_outreach else []
+            for event in stream_api(query, max_links, skip_stages):
+                stage = event["stage"]
+                if stage == "links":
+                    status.info(f"Found {event['count']} businesses on Google Maps, scraping details…")
+                elif stage == "error" and "index" not in event:
+                    st.error(f"Pipeline failed: {event['detail']}")
+                elif stage == "skipped":
+                    by_index.pop(event.get("index"), None)
+                elif "business" in event:
+                    by_index[event["index"]] = event["business"]
+                    status.info(f"{event['business']['name']}: {STAGE_LABELS.get(stage, stage)}")
+                if by_index:
+                    live_table.dataframe(to_dataframe([by_index[i] for i in sorted(by_index)]), use_container_width=True)
+        status.empty()
+        live_table.empty()
+
+        businesses = [by_index[i] for i in sorted(by_index)]
         if not businesses:
             st.warning("No businesses found. Try another query!")
         else:
-            df = pd.DataFrame([
-                {
-                    "Name": b["name"],
-                    "Website": b["website"],
-                    "Email": b["email"],
-                    "Summary": b.get("summary", ""),
-                    "Pain Points": b.get("pain_points", ""),
-                    "Outreach Email": b.get("outreach_email", ""),
-                    "Google Maps": b["url"]
-                }
-                for b in businesses
-            ])
+            df = to_dataframe(businesses)
             st.success(f"Found {len(businesses)} businesses.")
             st.dataframe(df, use_container_width=True)
             st.download_button(
@@ -39,6 +39,7 @@ class AppState(BaseModel):
     search_query: str
     businesses: Optional[List[Business]] = []
     max_links: int
+    bypass_llm_cache: bool = False
 
 class Interaction(BaseModel):
     lead_id: int
@@ -0,0 +1,183 @@
+import os
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from playwright.async_api import async_playwright
+from leadflow_ai.services.resource_policy import ResourcePolicy, resource_stats
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "4"))
+BROWSER_RECYCLE_AFTER = int(os.getenv("BROWSER_RECYCLE_AFTER", "100"))
+
+
+async def _safe_close(obj):
+    try:
+        await obj.close()
+    except Exception as e:
+        logging.debug(f"Ignoring error while closing {obj}: {e}")
+
+
+class BrowserPool:
+    """
+    Process-wide pool of reusable Chromium pages.
+
+    One headless browser is launched lazily and handed out as leased pages,
+    each living in its own browser context. At most ``size`` pages are leased
+    at once; returned pages are reset and kept for the next lease. The browser
+    is recycled after ``recycle_after`` leases, or as soon as it is found
+    disconnected, so memory leaks in long-running processes stay bounded.
+    """
+
+    def __init__(self, size: int = BROWSER_POOL_SIZE, recycle_after: int = BROWSER_RECYCLE_AFTER, headless: bool = True):
+        self.size = size
+        self.recycle_after = recycle_after
+        self.headless = headless
+        self.loop = asyncio.get_running_loop()
+        self._semaphore = asyncio.Semaphore(size)
+        self._lock = asyncio.Lock()
+        self._playwright = None
+        self._browser = None
+        self._served = 0
+        self._idle = []      # (browser, context, page) ready for reuse
+        self._active = {}    # browser -> number of pages currently leased
+        self.launches = 0
+        self.leases = 0
+
+    async def _launch(self):
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(headless=self.headless)
+        self._active[self._browser] = 0
+        self._served = 0
+        self.launches += 1
+        logging.info(f"🌐 Launched pooled Chromium (launch #{self.launches})")
+
+    async def _retire(self):
+        """Stop handing out the current browser; close it once its last lease returns."""
+        browser = self._browser
+        self._browser = None
+        if browser is None:
+            return
+        for entry in [e for e in self._idle if e[0] is browser]:
+            self._idle.remove(entry)
+            await _safe_close(entry[1])
+        if not self._active.get(browser):
+            self._active.pop(browser, None)
+            await _safe_close(browser)
+
+    def _is_healthy(self) -> bool:
+        return (
+            self._browser is not None
+            and self._browser.is_connected()
+            and self._served < self.recycle_after
+        )
+
+    async def _checkout(self):
+        async with self._lock:
+            if not self._is_healthy():
+                await self._retire()
+                await self._launch()
+            browser = self._browser
+            self._served += 1
+            self._active[browser] += 1
+            try:
+                while self._idle:
+                    _, context, page = self._idle.pop()
+                    if not page.is_closed():
+                        return browser, context, page
+                    await _safe_close(context)
+                context = await browser.new_context()
+                page = await context.new_page()
+                return browser, context, page
+            except Exception:
+                self._active[browser] -= 1
+                raise
+
+    async def _checkin(self, browser, context, page, reusable: bool):
+        async with self._lock:
+            if browser not in self._active:
+                # close() already shut this browser down while the page was leased
+                await _safe_close(context)
+                return
+            self._active[browser] -= 1
+            if reusable and browser is self._browser and browser.is_connected() and not page.is_closed():
+                self._idle.append((browser, context, page))
+            else:
+                await _safe_close(context)
+            if browser is not self._browser and self._active[browser] == 0:
+                del self._active[browser]
+                await _safe_close(browser)
+
+    @asynccontextmanager
+    async def lease(self, stage: str | None = None):
+        """
+        Lease a page for the duration of the ``async with`` block. With a
+        ``stage`` the page loads only what that stage's ResourcePolicy allows.
+        """
+        async with self._semaphore:
+            browser, context, page = await self._checkout()
+            self.leases += 1
+            policy = ResourcePolicy(stage) if stage else None
+            reusable = True
+            try:
+                if policy:
+                    await policy.attach(page)
+                yield page
+            except BaseException:
+                # A page that blew up mid-navigation is not worth resetting
+                reusable = False
+                raise
+            finally:
+                if reusable:
+                    try:
+                        if policy:
+                            await policy.detach()
+                        await context.clear_cookies()
+                        await page.goto("about:blank")
+                    except Exception:
+                        reusable = False
+                await self._checkin(browser, context, page, reusable)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "launches": self.launches,
+            "leases": self.leases,
+            "idle_pages": len(self._idle),
+            "active_pages": sum(self._active.values()),
+            "connected": bool(self._browser and self._browser.is_connected()),
+            "resources": resource_stats(),
+        }
+
+    async def close(self):
+        async with self._lock:
+            for _, context, _ in self._idle:
+                await _safe_close(context)
+            self._idle.clear()
+            for browser in list(self._active):
+                await _safe_close(browser)
+            self._active.clear()
+            self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+
+_pool: BrowserPool | None = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the shared pool, creating it for the running event loop if needed."""
+    global _pool
+    if _pool is None or _pool.loop is not asyncio.get_running_loop():
+        _pool = BrowserPool()
+    return _pool
+
+
+async def close_browser_pool():
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
@@ -0,0 +1,175 @@
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from dotenv import load_dotenv
+
+load_dotenv()
+
+CACHE_DIR = os.getenv("LEADFLOW_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "leadflow_ai"))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+CACHE_DISABLED = os.getenv("CACHE_DISABLED", "").lower() in ("1", "true", "yes")
+
+# Seconds an entry is served without revalidation, per source.
+# Override any of them with e.g. CACHE_TTL_WEBSITE=3600.
+DEFAULT_TTLS = {
+    "maps_search": 6 * 3600,
+    "maps": 7 * 24 * 3600,
+    "website": 24 * 3600,
+    "search": 24 * 3600,
+    "hunter": 7 * 24 * 3600,
+    "overpass": 7 * 24 * 3600,
+    "fetch_tier": 7 * 24 * 3600,
+}
+
+
+def ttl_for(source: str) -> float:
+    return float(os.getenv(f"CACHE_TTL_{source.upper()}", DEFAULT_TTLS.get(source, 24 * 3600)))
+
+
+@dataclass
+class CacheEntry:
+    body: str
+    fetched_at: float
+    ttl: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() - self.fetched_at < self.ttl
+
+    def validators(self) -> dict:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class PageCache:
+    """
+    Persistent, content-addressed page cache backed by SQLite.
+
+    Bodies are stored once per SHA-256 digest and referenced from
+    ``(source, key)`` entries carrying the fetch time, TTL and HTTP validators.
+    Once the stored bodies exceed ``max_bytes`` the least recently read entries
+    are evicted. Hit/miss counters are kept per source.
+    """
+
+    def __init__(self, path: str, max_bytes: int = CACHE_MAX_BYTES, enabled: bool = True):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.counters: Counter = Counter()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._bytes = 0
+        if enabled:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS blobs (
+                    digest TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS entries (
+                    source TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    ttl REAL NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    last_access REAL NOT NULL,
+                    PRIMARY KEY (source, key)
+                );
+                CREATE INDEX IF NOT EXISTS entries_last_access ON entries(last_access);
+            """)
+            self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def get(self, source: str, key: str) -> CacheEntry | None:
+        """Return the entry (fresh or stale) or None; check ``entry.fresh`` before serving it as-is."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT b.body, e.fetched_at, e.ttl, e.etag, e.last_modified "
+                "FROM entries e JOIN blobs b ON b.digest = e.digest WHERE e.source = ? AND e.key = ?",
+                (source, key),
+            ).fetchone()
+            if row is None:
+                self.counters[f"{source}.miss"] += 1
+                return None
+            self._conn.execute(
+                "UPDATE entries SET last_access = ? WHERE source = ? AND key = ?", (time.time(), source, key)
+            )
+        entry = CacheEntry(row[0].decode("utf-8"), row[1], row[2], row[3], row[4])
+        self.counters[f"{source}.{'hit' if entry.fresh else 'stale'}"] += 1
+        return entry
+
+    def set(self, source: str, key: str, body: str, etag: str | None = None,
+            last_modified: str | None = None, ttl: float | None = None):
+        if not self.enabled:
+            return
+        data = body.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        now = time.time()
+        with self._lock:
+            inserted = self._conn.execute(
+                "INSERT OR IGNORE INTO blobs (digest, body, size) VALUES (?, ?, ?)", (digest, data, len(data))
+            ).rowcount
+            self._bytes += len(data) if inserted else 0
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (source, key, digest, fetched_at, ttl, etag, last_modified, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (source, key, digest, now, ttl if ttl is not None else ttl_for(source), etag, last_modified, now),
+            )
+            self.counters[f"{source}.store"] += 1
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def refresh(self, source: str, key: str):
+        """Mark a stale entry fresh again after a 304 Not Modified."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET fetched_at = ? WHERE source = ? AND key = ?", (time.time(), source, key)
+            )
+        self.counters[f"{source}.revalidated"] += 1
+
+    def _evict(self):
+        target = self.max_bytes * 0.9
+        while self._bytes > target:
+            victims = self._conn.execute(
+                "SELECT source, key FROM entries ORDER BY last_access LIMIT 50"
+            ).fetchall()
+            if not victims:
+                break
+            self._conn.executemany("DELETE FROM entries WHERE source = ? AND key = ?", victims)
+            self._conn.execute("DELETE FROM blobs WHERE digest NOT IN (SELECT digest FROM entries)")
+            self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+            self.counters["evicted"] += len(victims)
+        logging.info(f"Page cache evicted down to {self._bytes} bytes")
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, "bytes": self._bytes, "max_bytes": self.max_bytes, **self.counters}
+
+
+_cache: PageCache | None = None
+
+
+def get_page_cache() -> PageCache:
+    global _cache
+    if _cache is None:
+        _cache = PageCache(os.path.join(CACHE_DIR, "pages.sqlite"), enabled=not CACHE_DISABLED)
+    return _cache
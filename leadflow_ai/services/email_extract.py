@@ -0,0 +1,160 @@
+import re
+import html
+from urllib.parse import unquote
+from leadflow_ai.services.page_store import PageContent
+
+LOCAL_PART_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_.+-")
+MAX_LOCAL_PART = 64
+DOMAIN_RE = re.compile(r"[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
+VALID_EMAIL_RE = re.compile(r"^[\w\.-]+@[\w\.-]+\.\w+$")
+# "jane [at] acme [dot] com", "jane(at)acme.com", "jane {at} acme {dot} co {dot} uk"
+_DOT = r"\s*[\[\(\{<]\s*dot\s*[\]\)\}>]\s*"
+# Starts with a character class so the scan for it stays in C
+AT_TOKEN_RE = re.compile(r"[\[\(\{<]\s*at\s*[\]\)\}>]", re.IGNORECASE)
+OBFUSCATED_DOMAIN_RE = re.compile(rf"\s*([a-zA-Z0-9-]+(?:(?:{_DOT}|\.)[a-zA-Z0-9-]+)+)", re.IGNORECASE)
+DOT_RE = re.compile(_DOT, re.IGNORECASE)
+CLOUDFLARE_HREF = "/cdn-cgi/l/email-protection#"
+
+FORBIDDEN_EMAIL_PATTERNS = [
+    "bootstrap", "fontawesome", "googleapis", "cloudflare", "cdn",
+    "localhost", "example.com", "fancybox", "admin@", "test@", "noreply@"
+]
+FORBIDDEN_RE = re.compile("|".join(map(re.escape, FORBIDDEN_EMAIL_PATTERNS)))
+ROLE_RE = re.compile(r"info@|contact@|support@")
+TECHNICAL_RE = re.compile(r"dev@|agency|webmaster@")
+CONTEXT_RE = re.compile(r"contact|inquir|media|reach us|email us")
+# Characters either side of an email searched for CONTEXT_RE
+CONTEXT_WINDOW = 40
+
+
+def _local_part_start(text: str, end: int) -> int:
+    start = end
+    while start > 0 and end - start < MAX_LOCAL_PART and text[start - 1] in LOCAL_PART_CHARS:
+        start -= 1
+    return start
+
+
+def iter_emails(text: str):
+    """
+    ``(start, email)`` for each plain address in ``text``. Only the ``@`` signs
+    are visited (a C-level ``find``), and each is expanded to its local part
+    and domain, so cost grows with the number of ``@``, not the page size.
+    """
+    at = text.find("@")
+    while at != -1:
+        start = _local_part_start(text, at)
+        domain = DOMAIN_RE.match(text, at + 1) if start < at else None
+        if domain:
+            yield start, text[start:domain.end()]
+            at = text.find("@", domain.end())
+        else:
+            at = text.find("@", at + 1)
+
+
+def iter_obfuscated_emails(text: str):
+    """``(start, email)`` for each ``jane [at] acme [dot] com`` style address in ``text``."""
+    for token in AT_TOKEN_RE.finditer(text):
+        end = token.start()
+        while end > 0 and text[end - 1].isspace():
+            end -= 1
+        start = _local_part_start(text, end)
+        domain = OBFUSCATED_DOMAIN_RE.match(text, token.end())
+        if start < end and domain:
+            yield start, f"{text[start:end]}@{DOT_RE.sub('.', domain.group(1))}"
+
+
+def extract_emails_from_html(html_text: str) -> list[str]:
+    return [email for _, email in iter_emails(html_text)]
+
+
+def is_valid_email(email: str, domain: str = None) -> bool:
+    if not email or "@" not in email:
+        return False
+    email_l = email.lower()
+    if FORBIDDEN_RE.search(email_l):
+        return False
+    if domain and domain not in email_l:
+        # Optionally require the email to match business domain
+        return False
+    # Very basic check
+    return VALID_EMAIL_RE.match(email) is not None
+
+
+def decode_cfemail(encoded: str) -> str | None:
+    """Cloudflare email protection: hex bytes XORed with the first byte."""
+    try:
+        data = bytes.fromhex(encoded)
+        return bytes(byte ^ data[0] for byte in data[1:]).decode("utf-8") if data else None
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def _clean(email: str) -> str:
+    return email.strip().strip(".").lower()
+
+
+def _mailto_and_protected(page: PageContent) -> set[str]:
+    """Mailto links and Cloudflare-protected addresses, from one walk over the DOM."""
+    found = set()
+    for tag in page.soup.find_all(True):
+        href = tag.get("href")
+        if href:
+            if href[:7].lower() == "mailto:":
+                found.add(unquote(href[7:].split("?", 1)[0]))
+            elif CLOUDFLARE_HREF in href:
+                found.add(decode_cfemail(href.split("#", 1)[1]))
+        encoded = tag.get("data-cfemail")
+        if encoded:
+            found.add(decode_cfemail(encoded))
+    found.discard(None)
+    return found
+
+
+def _first_positions(text: str, obfuscated: bool = False) -> dict[str, int]:
+    """Where each address in ``text`` first appears, from a single scan."""
+    positions = {}
+    for start, email in iter_emails(text):
+        positions.setdefault(_clean(email), start)
+    if obfuscated:
+        for start, email in iter_obfuscated_emails(text):
+            positions.setdefault(_clean(email), start)
+    return positions
+
+
+def score_emails(page: PageContent) -> dict[str, int]:
+    """
+    Every valid email on the page, scored.
+
+    Candidates are mailto links and Cloudflare-protected addresses, plain
+    addresses in the entity-decoded HTML, and ``[at]``/``[dot]`` forms in the
+    visible text. One scan of the visible and footer text indexes where each
+    address appears, and scores come from that index: +10 for role addresses
+    (info@, contact@, support@), +5 if it is visible, +5 if it is in the
+    footer, +5 if a contact-ish word is within CONTEXT_WINDOW characters of its
+    first appearance, -5 for developer or agency addresses.
+    """
+    visible = page.visible_text.lower()
+    positions = _first_positions(visible, obfuscated=True)
+    in_footer = _first_positions(page.footer_text.lower())
+    candidates = {_clean(email) for email in _mailto_and_protected(page)}
+    candidates.update(_clean(email) for email in extract_emails_from_html(html.unescape(page.html)))
+    candidates.update(positions)
+
+    scores = {}
+    for email in candidates:
+        if not is_valid_email(email):
+            continue
+        score = 0
+        if ROLE_RE.search(email):
+            score += 10
+        index = positions.get(email)
+        if index is not None:
+            score += 5
+            if CONTEXT_RE.search(visible, max(0, index - CONTEXT_WINDOW), index + CONTEXT_WINDOW):
+                score += 5
+        if email in in_footer:
+            score += 5
+        if TECHNICAL_RE.search(email):
+            score -= 5
+        scores[email] = score
+    return scores
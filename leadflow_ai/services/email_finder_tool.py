@@ -1,98 +1,111 @@
-import re
+import os
+import asyncio
 import logging
-from urllib.parse import urljoin
-from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
+from urllib.parse import urljoin, urlsplit
+from dotenv import load_dotenv
 from leadflow_ai.agents.email_finder_agent import find_email_for_website_with_llm
-from langchain_openai import ChatOpenAI
-from leadflow_ai.schemas.lead import AppState
+from leadflow_ai.schemas.lead import AppState, Business
+from leadflow_ai.services.page_store import PageContent, fetch_page, normalize_url
+from leadflow_ai.services.email_extract import score_emails
+
+load_dotenv()
+
+
+def _env_list(name: str, default: str) -> list[str]:
+    return [item.strip() for item in os.getenv(name, default).split(",") if item.strip()]
+
+
+# Probed after the homepage when its own links don't lead anywhere better
+EMAIL_CANDIDATE_PATHS = _env_list("EMAIL_CANDIDATE_PATHS", "/contact,/about")
+# Homepage links whose text or href contains one of these are probed first
+EMAIL_LINK_KEYWORDS = [word.lower() for word in _env_list("EMAIL_LINK_KEYWORDS", "contact,about")]
+# Pages probed per website, homepage included
+EMAIL_MAX_PAGES = int(os.getenv("EMAIL_MAX_PAGES", "3"))
+# Websites searched at once by update_business_emails
+EMAIL_FINDER_CONCURRENCY = int(os.getenv("EMAIL_FINDER_CONCURRENCY", "8"))
+# A score at or above this stops probing; 15 is a role address (info@, contact@) shown on the page
+EMAIL_CONFIDENCE_SCORE = int(os.getenv("EMAIL_CONFIDENCE_SCORE", "15"))
+
+
+def _site(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower().removeprefix("www.")
+
+
+def candidate_urls(url: str, homepage: PageContent | None = None) -> list[str]:
+    """
+    Pages to probe after the homepage: its same-site links that mention an
+    EMAIL_LINK_KEYWORDS word, in page order, then EMAIL_CANDIDATE_PATHS.
+    At most EMAIL_MAX_PAGES - 1 of them.
+    """
+    links = []
+    if homepage is not None:
+        for anchor in homepage.soup.find_all("a", href=True):
+            href = anchor["href"].strip()
+            label = f"{anchor.get_text(' ', strip=True)} {href}".lower()
+            if any(word in label for word in EMAIL_LINK_KEYWORDS):
+                links.append(urljoin(url, href))
+    links += [urljoin(url, path) for path in EMAIL_CANDIDATE_PATHS]
+
+    candidates, seen = [], {normalize_url(url)}
+    for link in links:
+        key = normalize_url(link)
+        if urlsplit(link).scheme in ("http", "https") and _site(link) == _site(url) and key not in seen:
+            seen.add(key)
+            candidates.append(link)
+    return candidates[:max(EMAIL_MAX_PAGES - 1, 0)]
+
+
+async def _probe(url: str, order: int) -> list[tuple[int, int, str]]:
+    """``(score, -order, email)`` for each email on the page, so ties go to earlier pages."""
+    try:
+        page = await fetch_page(url, timeout=10000)
+    except Exception as e:
+        logging.warning(f"Failed to process {url}: {e}")
+        return []
+    # Mailto links, plain and obfuscated emails, ranked together
+    return [(score, -order, email) for email, score in score_emails(page).items()]
 
-def extract_emails_from_html(html: str) -> list[str]:
-    return re.findall(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", html)
 
-FORBIDDEN_EMAIL_PATTERNS = [
-    "bootstrap", "fontawesome", "googleapis", "cloudflare", "cdn",
-    "localhost", "example.com", "fancybox", "admin@", "test@", "noreply@"
-]
+def _confident(found: list) -> bool:
+    return bool(found) and max(found)[0] >= EMAIL_CONFIDENCE_SCORE
 
-def is_valid_email(email: str, domain: str = None) -> bool:
-    if not email or "@" not in email:
-        return False
-    email_l = email.lower()
-    if any(bad in email_l for bad in FORBIDDEN_EMAIL_PATTERNS):
-        return False
-    if domain and domain not in email_l:
-        # Optionally require the email to match business domain
-        return False
-    # Very basic check
-    return re.match(r"^[\w\.-]+@[\w\.-]+\.\w+$", email) is not None
-
-def smart_score_email(email, visible_text, footer_text):
-    s = 0
-    if "info@" in email or "contact@" in email or "support@" in email:
-        s += 10
-    if email.lower() in visible_text:
-        s += 5
-    if footer_text and email.lower() in footer_text:
-        s += 5
-    idx = visible_text.find(email.lower())
-    if idx != -1:
-        window = visible_text[max(0, idx-40):idx+40]
-        if any(w in window for w in ["contact", "inquir", "media", "reach us", "email us"]):
-            s += 5
-    if "dev@" in email or "agency" in email or "webmaster@" in email:
-        s -= 5
-    return s
 
 async def find_email_for_website(url: str, llm=None) -> dict:
+    """
+    Best-scoring email on the website. The homepage is probed first and is
+    enough when its best email reaches EMAIL_CONFIDENCE_SCORE. Otherwise the
+    candidate pages are fetched concurrently (each on its own pooled browser
+    context) and the rest are cancelled as soon as one crosses the threshold.
+    """
     logging.info(f"Finding email for {url}")
-    pages_to_try = ["", "/contact", "/about"]
-    best_email = None
-    best_score = float('-inf')
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-
-        for path in pages_to_try:
-            try:
-                full_url = urljoin(url, path)
-                await page.goto(full_url, timeout=10000)
-                await page.wait_for_timeout(2000)
-                content = await page.content()
-                soup = BeautifulSoup(content, "html.parser")
-                visible_text = soup.get_text(separator=" ").lower()
-                footer = soup.find("footer")
-                footer_text = footer.get_text(separator=" ").lower() if footer else ""
-
-                # Look for visible, user-facing mailto emails in the footer/contact
-                for a in soup.find_all("a", href=True):
-                    if a["href"].startswith("mailto:"):
-                        mailto_email = a["href"].replace("mailto:", "").strip()
-                        score = smart_score_email(mailto_email, visible_text, footer_text)
-                        if score > best_score:
-                            best_email, best_score = mailto_email, score
-
-                # Collect all emails and rank them
-                emails = set(extract_emails_from_html(content))
-                for email in emails:
-                    if is_valid_email(email):
-                        score = smart_score_email(email, visible_text, footer_text)
-                        if score > best_score:
-                            best_email, best_score = email, score
-
-            except Exception as e:
-                logging.warning(f"Failed to process {url + path}: {e}")
-                continue
-
-        await browser.close()
-
-    if best_email:
-        return {"email": best_email, "source": "smart_extractor"}
+    homepage = None
+    try:
+        homepage = await fetch_page(url, timeout=10000)
+        found = [(score, 0, email) for email, score in score_emails(homepage).items()]
+    except Exception as e:
+        logging.warning(f"Failed to process {url}: {e}")
+        found = []
+
+    probed = 1
+    if not _confident(found):
+        tasks = [asyncio.create_task(_probe(link, order))
+                 for order, link in enumerate(candidate_urls(url, homepage), start=1)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                found += await next_done
+                probed += 1
+                if _confident(found):
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    logging.info(f"Probed {probed} page(s) for {url}")
+
+    if found:
+        return {"email": max(found)[2], "source": "smart_extractor"}
 
     # Priority 3: fallback to LLM (if still no good email found)
-    if llm is None:
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
     try:
         email = await find_email_for_website_with_llm(url, llm)
         if email:
@@ -102,17 +115,36 @@ async def find_email_for_website(url: str, llm=None) -> dict:
 
     return {"email": None, "source": "not_found"}
 
+async def find_business_email(business: Business) -> bool:
+    """Fill in ``business.email`` if missing; False when no valid email could be found."""
+    if not business.email:
+        result = await find_email_for_website(business.website)
+        business.email = result.get("email")
+
+    if not business.email:
+        logging.info(f"🚫 Skipping {business.name} — No valid email found.")
+        return False
+    return True
+
 async def update_business_emails(state: AppState) -> AppState:
-    filtered_businesses = []
-    for business in state.businesses:
-        if not business.email:
-            result = await find_email_for_website(business.website)
-            business.email = result.get("email")
-
-        if business.email:  # Keep only businesses with emails
-            filtered_businesses.append(business)
-        else:
-            logging.info(f"🚫 Skipping {business.name} — No valid email found.")
-
-    state.businesses = filtered_businesses
+    # Businesses are searched concurrently, so slow agent fallbacks overlap
+    # instead of queueing behind each other
+    limit = asyncio.Semaphore(EMAIL_FINDER_CONCURRENCY)
+
+    async def find(business: Business) -> bool:
+        # One business failing must not discard what the others found
+        async with limit:
+            try:
+                return await find_business_email(business)
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():
+                    raise  # the batch itself is being cancelled
+                logging.warning(f"⚠️ Email search for {business.name} was cancelled; skipping it")
+            except Exception as e:
+                logging.warning(f"⚠️ Email search failed for {business.name}: {e}")
+            return False
+
+    found = await asyncio.gather(*(find(business) for business in state.businesses))
+    # Keep only businesses with emails
+    state.businesses = [business for business, ok in zip(state.businesses, found) if ok]
     return state
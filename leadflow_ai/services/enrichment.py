@@ -3,21 +3,42 @@ import httpx
 import logging
 import urllib.parse
 import asyncio
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
-from ..db.supabase import create_supabase
+from .fetcher import cached_http_get
+from .rate_limit import TokenBucket
+from .http_client import get_http_client
+from .geocode import reverse_geocode
+from .html_parser import parse_html
 
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
 
-async def reverse_geocode(lat, lng):
-    url = f"https://nominatim.openstreetmap.org/reverse?lat={lat}&lon={lng}&format=json"
-    headers = {"User-Agent": "YourAppNameHere"}
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json().get("display_name", "Unknown")
+# Targets enriched at once by /discover
+ENRICH_CONCURRENCY = int(os.getenv("ENRICH_CONCURRENCY", "8"))
+# Per-upstream request budgets (Nominatim's lives with the geocode cache)
+DUCKDUCKGO_RPM = float(os.getenv("DUCKDUCKGO_RPM", "30"))
+FIRECRAWL_RPM = float(os.getenv("FIRECRAWL_RPM", "10"))
+
+
+class _UpstreamLimits:
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.duckduckgo = TokenBucket(DUCKDUCKGO_RPM)
+        self.firecrawl = TokenBucket(FIRECRAWL_RPM)
+
+
+_limits: _UpstreamLimits | None = None
+
+
+def upstream_limits() -> _UpstreamLimits:
+    """Rate limiters shared by every caller of each upstream on the running loop."""
+    global _limits
+    if _limits is None or _limits.loop is not asyncio.get_running_loop():
+        _limits = _UpstreamLimits()
+    return _limits
+
+
 
 async def enrich_target(target: dict) -> dict:
     logging.info(f"Enriching target: {target}")
@@ -30,15 +51,6 @@ async def enrich_target(target: dict) -> dict:
     if address == 'Unknown':
         address = await reverse_geocode(lat, lng)
         logging.info(f"Reverse geocoded address: {address}")
-        # Log the updated address
-        logging.info(f"Updated address from reverse geocoding: {address}")
-        # Update Supabase with the new address
-        unique_hash = hash((name, lat, lng))
-        supabase = await create_supabase()
-        await supabase.table("local_targets").update({
-            "address": address
-        }).match({"unique_hash": unique_hash}).execute()
-        logging.info(f"Address updated in Supabase for hash={unique_hash}")
 
     # Normalize name and address
     name = name.strip().title()
@@ -52,37 +64,35 @@ async def enrich_target(target: dict) -> dict:
     }
 
     try:
-        async with httpx.AsyncClient(follow_redirects=True) as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            results = soup.find_all('a', {'class': 'result__a'}, limit=5)
-            valid_domains = []
-            skip_domains = ["wikipedia.org", "realtor.com", "trulia.com", "yelp.com", "zillow.com", "booking.com", "apartments.com"]
-
-            for result in results:
-                link = result.get('href')
-                if link and "uddg=" in link:
-                    parsed = urllib.parse.parse_qs(urllib.parse.urlparse(link).query)
-                    url_clean = parsed.get("uddg", [None])[0]
-                    if not url_clean:
-                        url_clean = link
-                else:
+        search_html = await cached_http_get(url, headers=headers, source="search", limiter=upstream_limits().duckduckgo)
+        soup = parse_html(search_html)
+        results = soup.find_all('a', {'class': 'result__a'}, limit=5)
+        valid_domains = []
+        skip_domains = ["wikipedia.org", "realtor.com", "trulia.com", "yelp.com", "zillow.com", "booking.com", "apartments.com"]
+
+        for result in results:
+            link = result.get('href')
+            if link and "uddg=" in link:
+                parsed = urllib.parse.parse_qs(urllib.parse.urlparse(link).query)
+                url_clean = parsed.get("uddg", [None])[0]
+                if not url_clean:
                     url_clean = link
+            else:
+                url_clean = link
 
-                domain = urllib.parse.urlparse(url_clean).netloc if url_clean else "Unknown"
+            domain = urllib.parse.urlparse(url_clean).netloc if url_clean else "Unknown"
 
-                if not url_clean or not domain or any(spam in domain for spam in skip_domains):
-                    logging.info(f"Skipped domain: {domain} from link: {url_clean}")
-                    continue
+            if not url_clean or not domain or any(spam in domain for spam in skip_domains):
+                logging.info(f"Skipped domain: {domain} from link: {url_clean}")
+                continue
 
-                logging.info(f"Selected domain: {domain} from link: {url_clean}")
-                valid_domains.append((domain, url_clean))
+            logging.info(f"Selected domain: {domain} from link: {url_clean}")
+            valid_domains.append((domain, url_clean))
 
-            if valid_domains:
-                domain, url_clean = valid_domains[0]
-            else:
-                raise ValueError("No valid domain found, triggering fallback.")
+        if valid_domains:
+            domain, url_clean = valid_domains[0]
+        else:
+            raise ValueError("No valid domain found, triggering fallback.")
 
     except (httpx.HTTPStatusError, ValueError) as e:
         logging.warning(f"Primary enrichment failed, error: {e}. Triggering fallback to Firecrawl.")
@@ -98,49 +108,26 @@ async def enrich_target(target: dict) -> dict:
             "numResults": 1
         }
 
-        async def fetch_with_retry(url, headers, json, retries=3, backoff_factor=0.3):
-            for attempt in range(retries):
-                try:
-                    async with httpx.AsyncClient() as client:
-                        response = await client.post(url, headers=headers, json=json)
-                        response.raise_for_status()
-                        return response.json()
-                except (httpx.HTTPStatusError, httpx.RequestError) as e:
-                    if attempt < retries - 1:
-                        sleep_time = backoff_factor * (2 ** attempt)
-                        logging.warning(f"Retrying in {sleep_time} seconds due to error: {e}")
-                        await asyncio.sleep(sleep_time)
-                    else:
-                        logging.error(f"Failed after {retries} attempts: {e}")
-                        raise
-
         try:
-            data = await fetch_with_retry(url, headers, payload)
+            # Retries and backoff come from the shared client's policy
+            response = await get_http_client().post(url, headers=headers, json=payload,
+                                                    limiter=upstream_limits().firecrawl)
+            response.raise_for_status()
+            data = response.json()
             website = data.get('urls', [None])[0]
             domain = urllib.parse.urlparse(website).netloc if website else "Unknown"
 
             if not website or not domain or any(spam in domain for spam in skip_domains):
                 logging.info(f"Fallback skipped domain: {domain} from link: {website}")
-                return target
+                return {**target, "address": address}
 
             logging.info(f"Fallback selected domain: {domain} from link: {website}")
 
         except Exception as e:
             logging.error(f"Error during Firecrawl fallback: {e}", exc_info=True)
-            return target
-
-    # Update Supabase
-    unique_hash = hash((name, lat, lng))
-    logging.info(f"Updating record: domain={domain}, website={url_clean} for hash={unique_hash}")
-    supabase = await create_supabase()
-    res = await supabase.table("local_targets").update({
-        "address": address,
-        "domain": domain,
-        "website": url_clean
-    }).match({"unique_hash": unique_hash}).execute()
-    logging.info(f"Supabase update response: {res}")
+            return {**target, "address": address}
 
-    # Return the enriched target
+    # Return the enriched target; the caller stores it with a single upsert
     return {
         "name": name,
         "address": address,
@@ -0,0 +1,186 @@
+import os
+import logging
+from collections import Counter
+from urllib.parse import urlsplit
+import httpx
+from dotenv import load_dotenv
+from leadflow_ai.services.browser_pool import get_browser_pool
+from leadflow_ai.services.resource_policy import measure_load
+from leadflow_ai.services.readiness import wait_for_ready
+from leadflow_ai.services.cache import get_page_cache
+from leadflow_ai.services.rate_limit import TokenBucket
+from leadflow_ai.services.http_client import get_http_client
+from leadflow_ai.services.html_parser import parse_html
+
+load_dotenv()
+
+# "auto" tries plain HTTP first and renders only pages that need it; "browser"
+# always renders, "http" never does
+FETCH_TIER = os.getenv("FETCH_TIER", "auto")
+# Visible characters that make a plain HTTP response usable without a browser
+STATIC_MIN_TEXT = int(os.getenv("STATIC_MIN_TEXT", "500"))
+
+BROWSER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/124.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+}
+
+# Pages served per tier: "http", "browser", "escalated" (tried HTTP, then rendered), and
+# "http_error" (a static site's error response, raised without rendering)
+fetch_tiers: Counter = Counter()
+_domain_tiers: dict[str, str] = {}
+
+
+async def _revalidate(url: str, entry, headers: dict | None = None) -> bool:
+    """Conditional GET against the origin; True when it answers 304 Not Modified."""
+    validators = entry.validators()
+    if not validators:
+        return False
+    try:
+        # A failed revalidation just means a full fetch, so don't retry it
+        response = await get_http_client().get(url, headers={**(headers or {}), **validators}, retries=0)
+        return response.status_code == 304
+    except httpx.HTTPError as e:
+        logging.debug(f"Revalidation failed for {url}: {e}")
+        return False
+
+
+async def _cached_website(url: str) -> str | None:
+    cache = get_page_cache()
+    entry = cache.get("website", url)
+    if entry and (entry.fresh or await _revalidate(url, entry)):
+        if not entry.fresh:
+            cache.refresh("website", url)
+        return entry.body
+    return None
+
+
+async def _render(url: str, timeout: int, ceiling_ms: int) -> str:
+    async with get_browser_pool().lease(stage="website") as page:
+        with measure_load("website"):
+            response = await page.goto(url, timeout=timeout)
+            await wait_for_ready(page, ceiling_ms=ceiling_ms)
+        html = await page.content()
+
+    headers = response.headers if response else {}
+    if not response or response.ok:
+        get_page_cache().set("website", url, html, etag=headers.get("etag"), last_modified=headers.get("last-modified"))
+    return html
+
+
+async def fetch_rendered_html(url: str, timeout: int = 20000, ceiling_ms: int = 2000) -> str:
+    """Navigate a pooled page to ``url`` and return the rendered HTML, via the on-disk cache."""
+    html = await _cached_website(url)
+    if html is None:
+        html = await _render(url, timeout, ceiling_ms)
+    return html
+
+
+def looks_static(html: str) -> bool:
+    """
+    Whether server-sent HTML already carries the page: enough visible text, or
+    a mailto link or non-empty footer. Shells that render in JavaScript have none.
+    """
+    soup = parse_html(html)
+    if len(soup.get_text(" ", strip=True)) >= STATIC_MIN_TEXT:
+        return True
+    footer = soup.find("footer")
+    return bool(soup.select_one('a[href^="mailto:" i]') or (footer and footer.get_text(strip=True)))
+
+
+def _domain(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+def _known_tier(domain: str) -> str | None:
+    if domain not in _domain_tiers:
+        entry = get_page_cache().get("fetch_tier", domain)
+        if entry and entry.fresh:
+            _domain_tiers[domain] = entry.body
+    return _domain_tiers.get(domain)
+
+
+def _remember_tier(domain: str, tier: str):
+    _domain_tiers[domain] = tier
+    get_page_cache().set("fetch_tier", domain, tier)
+    logging.info(f"Fetch tier for {domain}: {tier}")
+
+
+async def fetch_html(url: str, timeout: int = 20000, ceiling_ms: int = 2000) -> str:
+    """
+    HTML of ``url`` from the cheapest tier that serves it, via the on-disk cache.
+
+    A plain HTTP GET is tried first and kept when ``looks_static``; otherwise
+    the page is rendered in the browser pool. The first page fetched from a
+    domain decides its tier (kept for ``CACHE_TTL_FETCH_TIER``): later pages
+    of a JS-rendered or bot-walled site go straight to the browser, while
+    pages of a static site still fall back to it one by one when thin. On a
+    static site, only thin 2xx HTML pages and 401/403 are rendered: other
+    error statuses raise ``httpx.HTTPStatusError`` and non-HTML responses are
+    returned as they are.
+    """
+    html = await _cached_website(url)
+    if html is not None:
+        return html
+
+    domain = _domain(url)
+    forced = FETCH_TIER if FETCH_TIER in ("http", "browser") else None
+    known = forced or _known_tier(domain)
+    if known == "browser":
+        fetch_tiers["browser"] += 1
+        return await _render(url, timeout, ceiling_ms)
+
+    try:
+        response = await get_http_client().get(url, headers=BROWSER_HEADERS, timeout=timeout / 1000, retries=1)
+    except httpx.HTTPError as e:
+        if forced:
+            raise
+        logging.debug(f"HTTP tier failed for {url}: {e}")
+        response = None
+
+    if response is not None:
+        is_html = "html" in response.headers.get("content-type", "")
+        if known == "http" and not forced and not (
+                (response.is_success and is_html) or response.status_code in (401, 403)):
+            # A static site's missing page (e.g. a guessed /contact), error or file: the browser won't do better
+            fetch_tiers["http" if response.is_success else "http_error"] += 1
+            response.raise_for_status()
+            return response.text
+        if forced or (response.is_success and is_html and looks_static(response.text)):
+            response.raise_for_status()
+            if known is None:
+                _remember_tier(domain, "http")
+            fetch_tiers["http"] += 1
+            get_page_cache().set("website", url, response.text,
+                                 etag=response.headers.get("etag"), last_modified=response.headers.get("last-modified"))
+            return response.text
+        # A thin first page or a bot wall means the whole site needs the browser
+        if known is None and ((response.is_success and is_html) or response.status_code in (401, 403)):
+            _remember_tier(domain, "browser")
+
+    fetch_tiers["escalated"] += 1
+    return await _render(url, timeout, ceiling_ms)
+
+
+async def cached_http_get(url: str, headers: dict | None = None, source: str = "http",
+                          limiter: TokenBucket | None = None) -> str:
+    """
+    Plain HTTP GET through the on-disk cache. Stale entries are revalidated with
+    their ETag/Last-Modified; non-2xx responses raise ``httpx.HTTPStatusError``.
+    ``limiter`` is only charged when the request actually goes upstream.
+    """
+    cache = get_page_cache()
+    entry = cache.get(source, url)
+    if entry and entry.fresh:
+        return entry.body
+
+    request_headers = {**(headers or {}), **(entry.validators() if entry else {})}
+    response = await get_http_client().get(url, headers=request_headers, limiter=limiter)
+    if entry and response.status_code == 304:
+        cache.refresh(source, url)
+        return entry.body
+    response.raise_for_status()
+    cache.set(source, url, response.text,
+              etag=response.headers.get("etag"), last_modified=response.headers.get("last-modified"))
+    return response.text
@@ -1,19 +1,51 @@
+import time
+import asyncio
 import logging
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
-from leadflow_ai.schemas.lead import AppState
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+from leadflow_ai.schemas.lead import AppState, Business
+from leadflow_ai.services.llm_scheduler import LLMCallStats
+from leadflow_ai.services.llm_cache import CachedLLM
+from leadflow_ai.services.providers import Lazy, chat_model
+
+# Created on the first outreach email, not at import
+llm = Lazy(lambda: chat_model("gpt-4o-mini", max_retries=0), "outreach model")
+
+async def generate_outreach_for_business(business: Business, bypass_cache: bool = False) -> LLMCallStats | None:
+    """Write the outreach email for one summarized business in place; returns its call stats."""
+    if not (business.summary and business.pain_points):
+        return None
+    stats = LLMCallStats()
+    try:
+        business.outreach_email = await generate_outreach_email(
+            business.summary,
+            business.pain_points,
+            business.name,
+            stats=stats,
+            bypass_cache=bypass_cache
+        )
+        logging.info(f"Outreach email generated for {business.name}: {business.outreach_email}")
+    except Exception as e:
+        logging.warning(f"⚠️ Failed to generate outreach email for {business.name}: {e}")
+    logging.info(
+        f"✉️ {business.name}: {stats.latency:.2f}s, {stats.total_tokens} tokens "
+        f"(estimated {stats.estimated_tokens}), {stats.retries} retries"
+    )
+    return stats
 
 async def generate_outreach_email_node(state: AppState) -> dict:
-    for business in state.businesses:
-        if business.summary and business.pain_points:
-            
-            business.outreach_email = await generate_outreach_email(
-                business.summary,
-                business.pain_points,
-                business.name
-            )
-            logging.info(f"Outreach email generated for {business.name}: {business.outreach_email}")
+    # All emails are submitted at once; the LLM scheduler spaces them out
+    # within the configured RPM/TPM budgets
+    started = time.perf_counter()
+    results = await asyncio.gather(*(
+        generate_outreach_for_business(b, bypass_cache=state.bypass_llm_cache) for b in state.businesses
+    ))
+    calls = [s for s in results if s is not None]
+    if calls:
+        logging.info(
+            f"✉️ Generated {len(calls)} outreach emails in {time.perf_counter() - started:.2f}s: "
+            f"{sum(s.total_tokens for s in calls)} tokens, {sum(s.retries for s in calls)} retries, "
+            f"slowest {max(s.latency for s in calls):.2f}s"
+        )
     return {"businesses": state.businesses}
 
 outreach_prompt = PromptTemplate.from_template("""
@@ -49,13 +81,15 @@ We help busy teams reduce stress, prevent burnout, and increase clarity in just
 - Length: 4 short paragraphs max  
 - Respond only with the email body (no greeting or signature)  
 """)
+# Same summary, pain points and name -> same email: memoized across runs
+outreach_llm = CachedLLM(llm, outreach_prompt)
 
 
-async def generate_outreach_email(summary: str, pain_points: str, biz_name: str) -> str:
-    prompt = outreach_prompt.format(
-        summary=summary,
-        pain_points=pain_points,
-        biz_name=biz_name
-    )
-    response = await llm.ainvoke(prompt)
+async def generate_outreach_email(summary: str, pain_points: str, biz_name: str,
+                                  stats: LLMCallStats | None = None, bypass_cache: bool = False) -> str:
+    response = await outreach_llm.ainvoke({
+        "summary": summary,
+        "pain_points": pain_points,
+        "biz_name": biz_name
+    }, stats=stats, bypass=bypass_cache)
     return response.content if hasattr(response, "content") else str(response)
@@ -0,0 +1,84 @@
+import re
+import math
+import hashlib
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash(lat: float, lng: float, precision: int = 8) -> str:
+    """Standard base32 geohash; 8 characters is a cell of roughly 38m x 19m."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        interval, coord = (lng_range, lng) if even else (lat_range, lat)
+        mid = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            interval[0] = mid
+        else:
+            interval[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def geohash_bbox(cell: str) -> tuple[float, float, float, float]:
+    """``(lat_min, lat_max, lng_min, lng_max)`` covered by a geohash cell."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in cell:
+        value = _BASE32.index(char)
+        for shift in range(4, -1, -1):
+            interval = lng_range if even else lat_range
+            mid = (interval[0] + interval[1]) / 2
+            if value >> shift & 1:
+                interval[0] = mid
+            else:
+                interval[1] = mid
+            even = not even
+    return lat_range[0], lat_range[1], lng_range[0], lng_range[1]
+
+
+def geohash_neighbors(cell: str) -> list[str]:
+    """``cell`` and the eight cells around it."""
+    lat_min, lat_max, lng_min, lng_max = geohash_bbox(cell)
+    lat, lng = (lat_min + lat_max) / 2, (lng_min + lng_max) / 2
+    height, width = lat_max - lat_min, lng_max - lng_min
+    cells = []
+    for dlat in (-height, 0, height):
+        for dlng in (-width, 0, width):
+            neighbor_lat = max(-90.0, min(90.0, lat + dlat))
+            neighbor_lng = (lng + dlng + 180.0) % 360.0 - 180.0
+            neighbor = geohash(neighbor_lat, neighbor_lng, len(cell))
+            if neighbor not in cells:
+                cells.append(neighbor)
+    return cells
+
+
+def distance_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in meters."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi, dlambda = phi2 - phi1, math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * 6371008.8 * math.asin(math.sqrt(a))
+
+
+def normalize_name(name: str) -> str:
+    """Case, punctuation and spacing insensitive form of a place name."""
+    return " ".join(re.sub(r"[^\w]+", " ", name.casefold()).split())
+
+
+def target_key(name: str, lat: float, lng: float) -> int:
+    """
+    Stable id for a place: blake2b of its normalized name and geohash cell.
+
+    Unlike ``hash()`` it is the same in every process and survives the name
+    being re-cased during enrichment. Returned as a signed 64-bit int so it fits
+    a Postgres bigint column.
+    """
+    material = f"{normalize_name(name)}|{geohash(float(lat), float(lng))}".encode()
+    return int.from_bytes(hashlib.blake2b(material, digest_size=8).digest(), "big", signed=True)
@@ -0,0 +1,245 @@
+import os
+import time
+import sqlite3
+import asyncio
+import logging
+import threading
+from collections import Counter
+from dotenv import load_dotenv
+from leadflow_ai.services.cache import CACHE_DIR, CACHE_DISABLED
+from leadflow_ai.services.geo import geohash, geohash_neighbors, distance_m
+import httpx
+from leadflow_ai.services.http_client import HTTP_MAX_RETRIES, RETRY_STATUSES, get_http_client, retry_after
+from leadflow_ai.services.rate_limit import TokenBucket
+
+load_dotenv()
+
+# Nominatim's usage policy allows 1 request per second
+NOMINATIM_RPS = float(os.getenv("NOMINATIM_RPS", "1"))
+NOMINATIM_USER_AGENT = os.getenv("USER_AGENT", "my-app")
+GEOCODE_TTL = float(os.getenv("GEOCODE_TTL", str(90 * 24 * 3600)))
+# A reverse lookup within this distance of a cached point reuses its address
+GEOCODE_REUSE_METERS = float(os.getenv("GEOCODE_REUSE_METERS", "50"))
+GEOCODE_MAX_ENTRIES = int(os.getenv("GEOCODE_MAX_ENTRIES", "200000"))
+
+# Geohash precision of the reverse index; 7 characters is about 150m x 150m,
+# so the 3x3 neighborhood always covers GEOCODE_REUSE_METERS
+_CELL_PRECISION = 7
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.casefold().replace(",", " ").split())
+
+
+class GeocodeCache:
+    """
+    Persistent Nominatim cache in SQLite.
+
+    Forward lookups are keyed by the normalized query (misses are cached too).
+    Reverse lookups are stored per point and indexed by geohash cell, so a
+    point within ``reuse_m`` of a cached one reuses its address. Entries expire
+    after ``ttl``; past ``max_entries`` per table the least recently used go.
+    """
+
+    def __init__(self, path: str, ttl: float = GEOCODE_TTL, reuse_m: float = GEOCODE_REUSE_METERS,
+                 max_entries: int = GEOCODE_MAX_ENTRIES, enabled: bool = True):
+        self.ttl = ttl
+        self.reuse_m = reuse_m
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.counters: Counter = Counter()
+        self._lock = threading.Lock()
+        self._conn = None
+        if enabled:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS forward (
+                    query TEXT PRIMARY KEY,
+                    lat REAL,
+                    lng REAL,
+                    fetched_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS reverse (
+                    id INTEGER PRIMARY KEY,
+                    cell TEXT NOT NULL,
+                    lat REAL NOT NULL,
+                    lng REAL NOT NULL,
+                    address TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS reverse_cell ON reverse(cell);
+                CREATE INDEX IF NOT EXISTS forward_last_access ON forward(last_access);
+                CREATE INDEX IF NOT EXISTS reverse_last_access ON reverse(last_access);
+            """)
+
+    def get_forward(self, query: str, count: bool = True) -> tuple[bool, tuple[float, float] | None]:
+        """``(found, (lat, lng) or None)``; found with None means Nominatim had no match."""
+        if not self.enabled:
+            return False, None
+        key = normalize_query(query)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT lat, lng FROM forward WHERE query = ? AND fetched_at > ?", (key, time.time() - self.ttl)
+            ).fetchone()
+            if row is None:
+                self.counters["forward.miss"] += count
+                return False, None
+            self._conn.execute("UPDATE forward SET last_access = ? WHERE query = ?", (time.time(), key))
+        self.counters["forward.hit"] += count
+        return True, (row[0], row[1]) if row[0] is not None else None
+
+    def set_forward(self, query: str, point: tuple[float, float] | None):
+        if not self.enabled:
+            return
+        now = time.time()
+        lat, lng = point if point else (None, None)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO forward (query, lat, lng, fetched_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (normalize_query(query), lat, lng, now, now),
+            )
+            self._evict("forward")
+
+    def get_reverse(self, lat: float, lng: float, count: bool = True) -> str | None:
+        if not self.enabled:
+            return None
+        cells = geohash_neighbors(geohash(lat, lng, _CELL_PRECISION))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, lat, lng, address FROM reverse WHERE cell IN ({','.join('?' * len(cells))}) "
+                "AND fetched_at > ?",
+                (*cells, time.time() - self.ttl),
+            ).fetchall()
+            nearest = min(rows, key=lambda row: distance_m(lat, lng, row[1], row[2]), default=None)
+            if nearest is None or distance_m(lat, lng, nearest[1], nearest[2]) > self.reuse_m:
+                self.counters["reverse.miss"] += count
+                return None
+            self._conn.execute("UPDATE reverse SET last_access = ? WHERE id = ?", (time.time(), nearest[0]))
+        self.counters["reverse.hit"] += count
+        return nearest[3]
+
+    def set_reverse(self, lat: float, lng: float, address: str):
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO reverse (cell, lat, lng, address, fetched_at, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                (geohash(lat, lng, _CELL_PRECISION), lat, lng, address, now, now),
+            )
+            self._evict("reverse")
+
+    def _evict(self, table: str):
+        count = self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        excess = count - int(self.max_entries * 0.9)
+        self._conn.execute(
+            f"DELETE FROM {table} WHERE rowid IN (SELECT rowid FROM {table} ORDER BY last_access LIMIT ?)", (excess,)
+        )
+        self.counters[f"{table}.evicted"] += excess
+
+    def stats(self) -> dict:
+        if not self.enabled:
+            return {"enabled": False}
+        with self._lock:
+            sizes = {f"{table}.entries": self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                     for table in ("forward", "reverse")}
+        return {"enabled": True, **sizes, **self.counters}
+
+
+_cache: GeocodeCache | None = None
+_limiter: TokenBucket | None = None
+_limiter_loop = None
+
+
+def get_geocode_cache() -> GeocodeCache:
+    global _cache
+    if _cache is None:
+        _cache = GeocodeCache(os.path.join(CACHE_DIR, "geocode.sqlite"), enabled=not CACHE_DISABLED)
+    return _cache
+
+
+def _nominatim_limiter() -> TokenBucket:
+    global _limiter, _limiter_loop
+    if _limiter is None or _limiter_loop is not asyncio.get_running_loop():
+        _limiter, _limiter_loop = TokenBucket(1, 1 / NOMINATIM_RPS), asyncio.get_running_loop()
+    return _limiter
+
+
+async def _nominatim(path: str, params: dict, cached):
+    """
+    Query Nominatim within its rate limit. Callers queue on the limiter, so
+    ``cached`` is checked again once it is our turn: a lookup that completed
+    meanwhile may already answer this one, and then the slot is handed back.
+    Retries are made here rather than by the HTTP client, so each attempt
+    waits for its own slot; a 429 also pauses the limiter for everyone.
+    """
+    limiter = _nominatim_limiter()
+    await limiter.acquire()
+    hit = cached()
+    if hit is not None:
+        limiter.adjust(-1)
+        return hit
+    url = f"https://nominatim.openstreetmap.org/{path}"
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        if attempt:
+            await limiter.acquire()
+        try:
+            response = await get_http_client().get(
+                url, params={**params, "format": "json"}, headers={"User-Agent": NOMINATIM_USER_AGENT}, retries=0,
+            )
+        except httpx.TransportError as e:
+            if attempt == HTTP_MAX_RETRIES:
+                raise
+            logging.warning(f"⏳ Nominatim {path} failed ({type(e).__name__}: {e}); retry {attempt + 1}/{HTTP_MAX_RETRIES}")
+            continue
+        if response.status_code not in RETRY_STATUSES or attempt == HTTP_MAX_RETRIES:
+            break
+        delay = retry_after(response) or 2 ** attempt
+        logging.warning(f"⏳ Nominatim {path} answered {response.status_code}; "
+                        f"retry {attempt + 1}/{HTTP_MAX_RETRIES} in {delay:.0f}s")
+        limiter.pause(delay)
+    response.raise_for_status()
+    return response.json()
+
+
+async def geocode(query: str) -> tuple[float, float] | None:
+    """``(lat, lng)`` of the best Nominatim match for ``query``, or None when there is none."""
+    cache = get_geocode_cache()
+    found, point = cache.get_forward(query)
+    if found:
+        return point
+
+    def cached():
+        found, point = cache.get_forward(query, count=False)
+        return (point,) if found else None
+
+    data = await _nominatim("search", {"q": query}, cached)
+    if isinstance(data, tuple):
+        return data[0]
+    point = (float(data[0]["lat"]), float(data[0]["lon"])) if data else None
+    cache.set_forward(query, point)
+    logging.debug(f"Geocoded {query!r}: {point}")
+    return point
+
+
+async def reverse_geocode(lat, lng) -> str:
+    """Nominatim display name for a point, reusing any cached address within GEOCODE_REUSE_METERS."""
+    lat, lng = float(lat), float(lng)
+    cache = get_geocode_cache()
+    address = cache.get_reverse(lat, lng)
+    if address is not None:
+        return address
+
+    data = await _nominatim("reverse", {"lat": lat, "lon": lng}, lambda: cache.get_reverse(lat, lng, count=False))
+    if isinstance(data, str):
+        return data
+    address = data.get("display_name", "Unknown")
+    if address != "Unknown":
+        cache.set_reverse(lat, lng, address)
+    return address
@@ -0,0 +1,85 @@
+import os
+import logging
+from functools import lru_cache
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# BeautifulSoup tree builder for every page. "lxml" parses faster, but repairs
+# malformed markup differently from "html.parser", so extracted text can change
+HTML_PARSER = os.getenv("HTML_PARSER", "html.parser")
+
+# String types get_text() collects from ordinary tags (no comments, scripts or styles)
+TEXT_TYPES = (NavigableString, CData)
+
+
+def _installed(name: str) -> bool:
+    try:
+        __import__(name)
+        return True
+    except ImportError:
+        return False
+
+
+@lru_cache(maxsize=None)
+def parser_name() -> str:
+    """HTML_PARSER, or html.parser when that builder is not installed."""
+    if HTML_PARSER != "html.parser" and not _installed(HTML_PARSER):
+        logging.warning(f"⚠️ HTML_PARSER={HTML_PARSER} is not installed; using html.parser")
+        return "html.parser"
+    return HTML_PARSER
+
+
+def parse_html(html: str) -> BeautifulSoup:
+    return BeautifulSoup(html, parser_name())
+
+
+class TextIndex:
+    """
+    Stripped text of every element under ``root``, computed in one traversal.
+
+    The non-empty stripped strings are kept once, in document order, and each
+    element maps to the slice of them it contains. ``text(tag)`` then equals
+    ``tag.get_text(" ", strip=True)`` and ``length(tag)`` is O(1), so picking
+    e.g. the longest block never re-reads nested text. Build it after any
+    ``decompose()``; the index does not follow later changes to the tree.
+    """
+
+    def __init__(self, root: Tag):
+        self.pieces: list[str] = []
+        self._offsets = [0]
+        self._ranges: dict[int, tuple[int, int]] = {}
+        starts = [0]
+        stack = [iter(root.contents)]
+        tags = [root]
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                self._ranges[id(tags.pop())] = (starts.pop(), len(self.pieces))
+                stack.pop()
+            elif isinstance(child, Tag):
+                tags.append(child)
+                starts.append(len(self.pieces))
+                stack.append(iter(child.contents))
+            elif type(child) in TEXT_TYPES:
+                stripped = child.strip()
+                if stripped:
+                    self.pieces.append(stripped)
+                    self._offsets.append(self._offsets[-1] + len(stripped))
+
+    def _range(self, tag: Tag) -> tuple[int, int]:
+        return self._ranges.get(id(tag), (0, 0))
+
+    def has_text(self, tag: Tag) -> bool:
+        start, end = self._range(tag)
+        return end > start
+
+    def length(self, tag: Tag) -> int:
+        """``len(self.text(tag))`` without building the string."""
+        start, end = self._range(tag)
+        return self._offsets[end] - self._offsets[start] + max(0, end - start - 1)
+
+    def text(self, tag: Tag) -> str:
+        start, end = self._range(tag)
+        return " ".join(self.pieces[start:end])
@@ -0,0 +1,115 @@
+import os
+import random
+import asyncio
+import logging
+from urllib.parse import urlsplit
+import httpx
+from dotenv import load_dotenv
+from leadflow_ai.services.rate_limit import TokenBucket
+
+load_dotenv()
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+# Requests in flight to any single host
+HTTP_MAX_PER_HOST = int(os.getenv("HTTP_MAX_PER_HOST", "10"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "20"))
+
+# Statuses worth another attempt; anything else is returned to the caller as is
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HttpClient:
+    """
+    One keep-alive ``httpx.AsyncClient`` (HTTP/2 when ``h2`` is installed) for
+    every outbound call, with a cap on requests in flight per host and one
+    retry policy: transport errors and 429/5xx responses are retried with
+    exponential backoff and jitter, or after the server's Retry-After.
+    """
+
+    def __init__(self, max_connections: int = HTTP_MAX_CONNECTIONS, max_per_host: int = HTTP_MAX_PER_HOST,
+                 timeout: float = HTTP_TIMEOUT):
+        self.loop = asyncio.get_running_loop()
+        self.max_per_host = max_per_host
+        self.client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            follow_redirects=True,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self.max_per_host)
+        return self._hosts[host]
+
+    async def request(self, method: str, url: str, *, retries: int = HTTP_MAX_RETRIES,
+                      base_delay: float = 0.5, max_delay: float = 10.0,
+                      limiter: TokenBucket | None = None, **kwargs) -> httpx.Response:
+        """
+        Send a request under the retry policy. ``limiter`` is charged once per
+        attempt. The last response is returned even when its status is an
+        error; the last transport error is raised once retries run out.
+        """
+        for attempt in range(retries + 1):
+            if limiter is not None:
+                await limiter.acquire()
+            try:
+                async with self._host_limit(url):
+                    response = await self.client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if attempt == retries:
+                    raise
+                delay, reason = None, f"{type(e).__name__}: {e}"
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == retries:
+                    return response
+                delay, reason = retry_after(response), f"HTTP {response.status_code}"
+            if delay is None:
+                delay = min(max_delay, base_delay * 2 ** attempt) * (0.5 + random.random())
+            logging.warning(f"⏳ {method} {url} failed ({reason}); retry {attempt + 1}/{retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def close(self):
+        await self.client.aclose()
+
+
+def retry_after(response: httpx.Response) -> float | None:
+    """Seconds from the response's Retry-After header, when it gives a number."""
+    value = response.headers.get("retry-after")
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+_client: HttpClient | None = None
+
+
+def get_http_client() -> HttpClient:
+    """Return the shared client, creating it for the running event loop if needed."""
+    global _client
+    if _client is None or _client.loop is not asyncio.get_running_loop():
+        _client = HttpClient()
+    return _client
+
+
+async def close_http_client():
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
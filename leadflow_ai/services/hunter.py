@@ -1,34 +1,89 @@
 import os
-import requests
+import json
+import asyncio
+from urllib.parse import urlsplit
 from dotenv import load_dotenv
 from typing import List, Dict
 import logging
+from leadflow_ai.services.cache import get_page_cache, ttl_for
+from leadflow_ai.services.http_client import get_http_client
+from leadflow_ai.services.rate_limit import TokenBucket
 
 load_dotenv()
 
 HUNTER_API_KEY = os.getenv('HUNTER_API_KEY')
+HUNTER_URL = 'https://api.hunter.io/v2/domain-search'
+# Hunter allows 15 domain searches per second; stay a little under
+HUNTER_RPS = float(os.getenv('HUNTER_RPS', '10'))
+# Domains with no matching contacts are rechecked sooner than ones with contacts
+HUNTER_NEGATIVE_TTL = float(os.getenv('HUNTER_NEGATIVE_TTL', str(24 * 3600)))
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+_limiter: TokenBucket | None = None
+_limiter_loop = None
+_inflight: Dict[str, asyncio.Future] = {}
 
-def get_contacts(domain: str) -> List[Dict[str, str]]:
-    url = f'https://api.hunter.io/v2/domain-search?domain={domain}&api_key={HUNTER_API_KEY}'
-    logging.debug(f'Request URL: {url}')
-    response = requests.get(url)
-    logging.debug(f'Response Status Code: {response.status_code}')
-    data = response.json()
-    logging.debug(f'Response Data: {data}')
 
+def _get_limiter() -> TokenBucket:
+    global _limiter, _limiter_loop
+    if _limiter is None or _limiter_loop is not asyncio.get_running_loop():
+        _limiter, _limiter_loop = TokenBucket(HUNTER_RPS, 1.0), asyncio.get_running_loop()
+    return _limiter
+
+
+def normalize_domain(domain: str) -> str:
+    """``https://www.Example.com/about`` -> ``example.com``"""
+    domain = domain.strip().lower()
+    host = urlsplit(domain if '//' in domain else f'//{domain}').hostname or domain
+    return host.removeprefix('www.')
+
+
+def _select_contacts(data: dict) -> List[Dict[str, str]]:
     contacts = []
     if 'data' in data and 'emails' in data['data']:
         for email_info in data['data']['emails']:
-            if email_info['confidence'] >= 80 and 'Director' in email_info['position']:
-                logging.debug(f'Email Info: {email_info}')
+            if (email_info.get('confidence') or 0) >= 80 and 'Director' in (email_info.get('position') or ''):
                 contact = {
-                    'full_name': email_info.get('first_name', '') + ' ' + email_info.get('last_name', ''),
+                    'full_name': (email_info.get('first_name') or '') + ' ' + (email_info.get('last_name') or ''),
                     'email': email_info.get('value', ''),
                     'position': email_info.get('position', ''),
                     'confidence': email_info.get('confidence', '')
                 }
                 contacts.append(contact)
-    return contacts 
\ No newline at end of file
+    return contacts
+
+
+async def _search_domain(domain: str) -> List[Dict[str, str]]:
+    response = await get_http_client().get(
+        HUNTER_URL, params={'domain': domain, 'api_key': HUNTER_API_KEY}, limiter=_get_limiter()
+    )
+    logging.debug(f'Hunter domain-search {domain}: {response.status_code}')
+    if response.status_code != 200:
+        # Not cached: a quota or auth error says nothing about the domain
+        logging.warning(f"⚠️ Hunter lookup failed for {domain}: HTTP {response.status_code}")
+        return []
+    contacts = _select_contacts(response.json())
+    ttl = ttl_for('hunter') if contacts else HUNTER_NEGATIVE_TTL
+    get_page_cache().set('hunter', domain, json.dumps(contacts), ttl=ttl)
+    return contacts
+
+
+async def get_contacts(domain: str, bypass_cache: bool = False) -> List[Dict[str, str]]:
+    """
+    Director-level contacts Hunter knows for ``domain`` (confidence >= 80).
+
+    Results are cached per domain, empty ones for HUNTER_NEGATIVE_TTL, and
+    concurrent lookups of the same domain share one request.
+    """
+    domain = normalize_domain(domain)
+    if not bypass_cache:
+        entry = get_page_cache().get('hunter', domain)
+        if entry and entry.fresh:
+            return json.loads(entry.body)
+
+    future = _inflight.get(domain)
+    if future is None:
+        future = asyncio.ensure_future(_search_domain(domain))
+        _inflight[domain] = future
+        future.add_done_callback(lambda _: _inflight.pop(domain, None))
+    # shield: one caller giving up must not cancel the lookup for the others
+    return await asyncio.shield(future)
@@ -0,0 +1,126 @@
+import os
+import uuid
+import asyncio
+import logging
+from collections import Counter
+from dotenv import load_dotenv
+from leadflow_ai.db.jobs import JobStore, FINISHED_STATUSES
+from leadflow_ai.schemas.lead import AppState
+from leadflow_ai.services.pipeline_stream import stream_pipeline
+
+load_dotenv()
+
+MAX_CONCURRENT_JOBS = int(os.getenv("MAX_CONCURRENT_JOBS", "2"))
+MAX_QUEUED_JOBS = int(os.getenv("MAX_QUEUED_JOBS", "20"))
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class JobManager:
+    """
+    Runs pipeline jobs in the background on a fixed number of workers.
+
+    ``submit`` returns a job id immediately; at most ``workers`` jobs run at
+    once and at most ``max_queued`` wait behind them. Status, per-stage
+    progress and the final result are persisted in the JobStore so they can be
+    polled, and outlive the process.
+    """
+
+    def __init__(self, store: JobStore, workers: int = MAX_CONCURRENT_JOBS, max_queued: int = MAX_QUEUED_JOBS):
+        self.store = store
+        self.workers = workers
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self._workers: list[asyncio.Task] = []
+        self._running: dict[str, asyncio.Task] = {}
+        # Jobs cancel() was asked to stop; any other CancelledError is a failure
+        self._cancel_requested: set[str] = set()
+        self._stopping = False
+
+    def start(self):
+        interrupted = self.store.mark_unfinished_interrupted()
+        if interrupted:
+            logging.warning(f"Marked {interrupted} unfinished jobs from a previous run as interrupted")
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        # Jobs cut short by shutdown are interrupted, not failed
+        self._stopping = True
+        for task in [*self._workers, *self._running.values()]:
+            task.cancel()
+        await asyncio.gather(*self._workers, *self._running.values(), return_exceptions=True)
+        self._workers = []
+
+    def submit(self, request: dict) -> str:
+        job_id = uuid.uuid4().hex
+        if self._queue.full():
+            raise QueueFullError(f"{self._queue.maxsize} jobs already queued")
+        self.store.create(job_id, request)
+        self._queue.put_nowait(job_id)
+        return job_id
+
+    def cancel(self, job_id: str) -> dict | None:
+        job = self.store.get(job_id)
+        if job is None or job["status"] in FINISHED_STATUSES:
+            return job
+        task = self._running.get(job_id)
+        if task is not None:
+            if not task.cancel():
+                # Already finished; the worker just hasn't dropped it yet
+                return self.store.get(job_id)
+            self._cancel_requested.add(job_id)
+        # Still queued: the worker skips it when it comes up. Running: _run stops
+        # at its next await, and the caller sees the cancellation right away.
+        self.store.update(job_id, status="cancelled")
+        return self.store.get(job_id)
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            job = self.store.get(job_id)
+            if job is None or job["status"] != "queued":
+                continue
+            task = asyncio.create_task(self._run(job_id, job["request"]))
+            self._running[job_id] = task
+            try:
+                # wait() rather than await so cancelling one job never cancels the worker
+                await asyncio.wait({task})
+            finally:
+                self._running.pop(job_id, None)
+                self._cancel_requested.discard(job_id)
+
+    async def _run(self, job_id: str, request: dict):
+        self.store.update(job_id, status="running")
+        progress: Counter = Counter()
+        by_index = {}
+        try:
+            state = AppState(**{k: v for k, v in request.items() if k in AppState.model_fields})
+            async for event in stream_pipeline(state, skip=request.get("skip_stages", [])):
+                stage = event["stage"]
+                if stage == "error" and "index" not in event:
+                    raise RuntimeError(event["detail"])
+                if stage == "links":
+                    progress["links"] = event["count"]
+                elif stage != "done":
+                    progress[stage] += 1
+                if stage == "skipped":
+                    by_index.pop(event.get("index"), None)
+                elif "business" in event:
+                    by_index[event["index"]] = event["business"]
+                self.store.update(job_id, progress=progress)
+            result = {"search_query": state.search_query, "max_links": state.max_links,
+                      "businesses": [by_index[i] for i in sorted(by_index)]}
+            self.store.update(job_id, status="succeeded", result=result)
+        except asyncio.CancelledError:
+            if job_id in self._cancel_requested:
+                self.store.update(job_id, status="cancelled")
+            elif self._stopping:
+                self.store.update(job_id, status="interrupted")
+            else:
+                # A cancellation leaking out of the pipeline
+                logging.error(f"Job {job_id} was cancelled without a cancel request")
+                self.store.update(job_id, status="failed", error="cancelled without a cancel request")
+        except Exception as e:
+            logging.error(f"Job {job_id} failed: {e}", exc_info=True)
+            self.store.update(job_id, status="failed", error=str(e))
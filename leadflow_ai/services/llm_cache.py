@@ -0,0 +1,73 @@
+import os
+import json
+import hashlib
+from langchain_core.messages import AIMessage
+from dotenv import load_dotenv
+from leadflow_ai.services.cache import PageCache, CACHE_DIR
+from leadflow_ai.services.llm_scheduler import ainvoke_with_backoff, LLMCallStats
+from leadflow_ai.services.providers import Lazy
+
+load_dotenv()
+
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(30 * 24 * 3600)))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+LLM_CACHE_DISABLED = os.getenv("LLM_CACHE_DISABLED", "").lower() in ("1", "true", "yes")
+
+_cache: PageCache | None = None
+
+
+def get_llm_cache() -> PageCache:
+    global _cache
+    if _cache is None:
+        _cache = PageCache(os.path.join(CACHE_DIR, "llm.sqlite"), max_bytes=LLM_CACHE_MAX_BYTES,
+                           enabled=not LLM_CACHE_DISABLED)
+    return _cache
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class CachedLLM:
+    """
+    Memoizes completions of one prompt template on one chat model.
+
+    Results are keyed by (template hash, model, temperature, input hash), so
+    editing the template or switching model misses the cache while identical
+    inputs cost no tokens. Calls that miss go through the LLM scheduler.
+    ``llm`` may be a ``Lazy``, resolved on the first call.
+    """
+
+    def __init__(self, llm, template, ttl: float = LLM_CACHE_TTL, cache: PageCache | None = None):
+        self._llm = llm
+        self.template = template
+        self.ttl = ttl
+        self._cache = cache
+        self.template_hash = _sha256(template.template)
+
+    @property
+    def llm(self):
+        return self._llm.get() if isinstance(self._llm, Lazy) else self._llm
+
+    @property
+    def cache(self) -> PageCache:
+        return self._cache or get_llm_cache()
+
+    def key(self, inputs: dict) -> str:
+        model = getattr(self.llm, "model_name", None) or type(self.llm).__name__
+        temperature = getattr(self.llm, "temperature", None)
+        input_hash = _sha256(json.dumps(inputs, sort_keys=True, default=str))
+        return f"{self.template_hash}:{model}:{temperature}:{input_hash}"
+
+    async def ainvoke(self, inputs: dict, stats: LLMCallStats | None = None, bypass: bool = False) -> AIMessage:
+        """Format the template with ``inputs`` and complete it; ``bypass`` skips the lookup but refreshes the entry."""
+        key = self.key(inputs)
+        if not bypass:
+            entry = self.cache.get("llm", key)
+            if entry and entry.fresh:
+                return AIMessage(content=entry.body)
+
+        response = await ainvoke_with_backoff(self.llm, self.template.format(**inputs), stats=stats)
+        content = response.content if hasattr(response, "content") else str(response)
+        self.cache.set("llm", key, content, ttl=self.ttl)
+        return response if isinstance(response, AIMessage) else AIMessage(content=content)
@@ -0,0 +1,145 @@
+import os
+import time
+import random
+import asyncio
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from dotenv import load_dotenv
+from leadflow_ai.services.rate_limit import TokenBucket
+
+load_dotenv()
+
+# Max OpenAI requests in flight across the whole process
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "10"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+# Account-level budgets, shared by every LLM call in the process
+LLM_RPM = int(os.getenv("LLM_RPM", "500"))
+LLM_TPM = int(os.getenv("LLM_TPM", "200000"))
+# Completion size assumed when budgeting a request that sets no max_tokens
+LLM_EXPECTED_COMPLETION_TOKENS = int(os.getenv("LLM_EXPECTED_COMPLETION_TOKENS", "500"))
+
+
+@dataclass
+class LLMCallStats:
+    latency: float = 0.0
+    estimated_tokens: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    retries: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+class _Budgets:
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.in_flight = asyncio.Semaphore(LLM_CONCURRENCY)
+        self.requests = TokenBucket(LLM_RPM)
+        self.tokens = TokenBucket(LLM_TPM)
+
+
+_budgets: _Budgets | None = None
+
+
+def _get_budgets() -> _Budgets:
+    global _budgets
+    if _budgets is None or _budgets.loop is not asyncio.get_running_loop():
+        _budgets = _Budgets()
+    return _budgets
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # tiktoken downloads its encoding files on first use
+        logging.warning(f"tiktoken unavailable ({e}); estimating tokens from length")
+        return None
+
+
+def estimate_tokens(prompt, model: str = "gpt-4o-mini") -> int:
+    """Prompt size in tokens; a chars/4 guess when tiktoken is unavailable."""
+    text = prompt if isinstance(prompt, str) else str(prompt)
+    encoding = _encoding(model)
+    return len(encoding.encode(text)) if encoding else len(text) // 4 + 1
+
+
+def is_rate_limit_error(e: Exception) -> bool:
+    status = getattr(e, "status_code", None) or getattr(getattr(e, "response", None), "status_code", None)
+    return status == 429 or type(e).__name__ == "RateLimitError"
+
+
+def retry_after_seconds(e: Exception) -> float | None:
+    """Server-suggested wait from a 429 response, if it sent one."""
+    headers = getattr(getattr(e, "response", None), "headers", None) or {}
+    for name in ("retry-after-ms", "retry-after"):
+        value = headers.get(name)
+        if value:
+            try:
+                return float(value) / (1000 if name.endswith("-ms") else 1)
+            except ValueError:
+                pass
+    return None
+
+
+async def ainvoke_with_backoff(llm, prompt, retries: int = LLM_MAX_RETRIES,
+                               base_delay: float = 1.0, max_delay: float = 30.0,
+                               stats: LLMCallStats | None = None):
+    """
+    ``llm.ainvoke`` scheduled under the process-wide concurrency cap and the
+    requests/tokens-per-minute budgets.
+
+    The prompt's token count is estimated up front and reserved from the TPM
+    budget, then corrected from the response's usage metadata. A 429 refunds
+    that reservation, pauses the budgets for every caller and is retried with
+    exponential backoff and jitter (or the server's Retry-After); ``llm``
+    should not retry on its own (``chat_model(..., max_retries=0)``). Any other error is raised
+    immediately. Pass ``stats`` to collect latency, token usage and retries.
+    """
+    stats = stats if stats is not None else LLMCallStats()
+    budgets = _get_budgets()
+    model = getattr(llm, "model_name", None) or "gpt-4o-mini"
+    expected_completion = getattr(llm, "max_tokens", None) or LLM_EXPECTED_COMPLETION_TOKENS
+    stats.estimated_tokens = estimate_tokens(prompt, model) + expected_completion
+    started = time.perf_counter()
+
+    async with budgets.in_flight:
+        for attempt in range(retries):
+            await budgets.requests.acquire()
+            await budgets.tokens.acquire(stats.estimated_tokens)
+            try:
+                response = await llm.ainvoke(prompt)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == retries - 1:
+                    stats.latency = time.perf_counter() - started
+                    raise
+                delay = retry_after_seconds(e) or min(max_delay, base_delay * 2 ** attempt)
+                delay += random.uniform(0, delay / 4)
+                stats.retries += 1
+                # The rejected request used no tokens; the retry reserves its estimate again
+                budgets.tokens.adjust(-stats.estimated_tokens)
+                # Back every caller off, not just this one
+                budgets.requests.pause(delay)
+                budgets.tokens.pause(delay)
+                logging.warning(f"LLM rate limited, retrying in {delay:.1f}s (attempt {attempt + 1}/{retries})")
+                await asyncio.sleep(delay)
+                continue
+
+            usage = getattr(response, "usage_metadata", None) or {}
+            stats.prompt_tokens = usage.get("input_tokens", 0)
+            stats.completion_tokens = usage.get("output_tokens", 0)
+            if stats.total_tokens:
+                budgets.tokens.adjust(stats.total_tokens - stats.estimated_tokens)
+            stats.latency = time.perf_counter() - started
+            return response
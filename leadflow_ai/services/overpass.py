@@ -0,0 +1,128 @@
+import os
+import json
+import math
+import logging
+from dotenv import load_dotenv
+from leadflow_ai.services.cache import get_page_cache
+from leadflow_ai.services.geo import geohash, geohash_bbox, distance_m
+from leadflow_ai.services.http_client import get_http_client
+
+load_dotenv()
+
+OVERPASS_URL = os.getenv("OVERPASS_URL", "https://overpass-api.de/api/interpreter")
+# Geohash length of a cached tile; 5 characters is roughly 5km x 5km
+OVERPASS_TILE_PRECISION = int(os.getenv("OVERPASS_TILE_PRECISION", "5"))
+# Missing tiles fetched per Overpass query; 4 tiles (about 100 km²) stays well inside [timeout:60]
+OVERPASS_TILES_PER_QUERY = int(os.getenv("OVERPASS_TILES_PER_QUERY", "4"))
+
+# Everything /discover looks for, as Overpass selectors
+SELECTORS = (
+    'node["office"]',
+    'node["amenity"="coworking_space"]',
+    'way["building"="apartments"]',
+    'way["amenity"="coworking_space"]',
+    'way["hotel"="hotel"]',
+)
+
+_METERS_PER_DEGREE = 111320.0
+
+
+def element_point(element: dict) -> tuple[float, float] | None:
+    lat = element.get('lat', element.get('center', {}).get('lat'))
+    lon = element.get('lon', element.get('center', {}).get('lon'))
+    return (lat, lon) if lat is not None and lon is not None else None
+
+
+def tiles_for_circle(lat: float, lng: float, radius_m: float, precision: int = OVERPASS_TILE_PRECISION) -> list[str]:
+    """Geohash tiles of ``precision`` that intersect the circle."""
+    dlat = radius_m / _METERS_PER_DEGREE
+    dlng = radius_m / (_METERS_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+    lat_min, lat_max, lng_min, lng_max = geohash_bbox(geohash(lat, lng, precision))
+    height, width = lat_max - lat_min, lng_max - lng_min
+    tiles = []
+    row = lat - dlat
+    while row <= lat + dlat + height:
+        column = lng - dlng
+        while column <= lng + dlng + width:
+            tile = geohash(min(row, lat + dlat), min(column, lng + dlng), precision)
+            if tile not in tiles and _tile_distance_m(tile, lat, lng) <= radius_m:
+                tiles.append(tile)
+            column += width
+        row += height
+    return tiles
+
+
+def _tile_distance_m(tile: str, lat: float, lng: float) -> float:
+    """Distance from the point to the nearest edge of the tile (0 inside it)."""
+    lat_min, lat_max, lng_min, lng_max = geohash_bbox(tile)
+    return distance_m(lat, lng, min(max(lat, lat_min), lat_max), min(max(lng, lng_min), lng_max))
+
+
+def _tiles_query(tiles: list[str]) -> str:
+    clauses = []
+    for tile in tiles:
+        lat_min, lat_max, lng_min, lng_max = geohash_bbox(tile)
+        bbox = f"{lat_min},{lng_min},{lat_max},{lng_max}"
+        clauses.extend(f"  {selector}({bbox});" for selector in SELECTORS)
+    return "[out:json][timeout:60];\n(\n" + "\n".join(clauses) + "\n);\nout center;\n"
+
+
+async def _fetch_tiles(tiles: list[str], headers: dict | None = None) -> tuple[dict[str, list[dict]], str | None]:
+    """
+    One Overpass query for ``tiles``; each element is filed under the tile its
+    point falls in. Also returns the response's ``remark``: Overpass answers
+    200 with a remark and partial elements when the query ran out of time or memory.
+    """
+    response = await get_http_client().post(OVERPASS_URL, content=_tiles_query(tiles), headers=headers)
+    response.raise_for_status()
+    data = response.json()
+    by_tile = {tile: [] for tile in tiles}
+    precision = len(tiles[0])
+    for element in data.get('elements', []):
+        point = element_point(element)
+        if point is None:
+            continue
+        # Ways crossing into a neighbouring tile belong to the tile their center is in
+        tile = geohash(point[0], point[1], precision)
+        if tile in by_tile:
+            by_tile[tile].append(element)
+    return by_tile, data.get('remark')
+
+
+async def search_elements(lat: float, lng: float, radius_m: float, headers: dict | None = None) -> list[dict]:
+    """
+    Overpass elements within ``radius_m`` of the point, assembled from cached
+    tiles. Only tiles missing from the cache are fetched (batched into a few
+    queries) and each is cached for ``CACHE_TTL_OVERPASS``, unless its query
+    came back partial; those tiles serve this search only.
+    """
+    lat, lng = float(lat), float(lng)
+    cache = get_page_cache()
+    tiles = tiles_for_circle(lat, lng, radius_m)
+    elements_by_tile, missing = {}, []
+    for tile in tiles:
+        entry = cache.get("overpass", tile)
+        if entry and entry.fresh:
+            elements_by_tile[tile] = json.loads(entry.body)
+        else:
+            missing.append(tile)
+
+    for i in range(0, len(missing), OVERPASS_TILES_PER_QUERY):
+        fetched, remark = await _fetch_tiles(missing[i:i + OVERPASS_TILES_PER_QUERY], headers)
+        if remark:
+            logging.warning(f"Overpass returned partial results for {len(fetched)} tiles, not caching them: {remark}")
+        for tile, elements in fetched.items():
+            if not remark:
+                cache.set("overpass", tile, json.dumps(elements))
+            elements_by_tile[tile] = elements
+    logging.info(f"Overpass: {len(tiles) - len(missing)} of {len(tiles)} tiles cached, fetched {len(missing)}")
+
+    results, seen = [], set()
+    for tile in tiles:
+        for element in elements_by_tile[tile]:
+            point = element_point(element)
+            key = (element.get('type'), element.get('id'))
+            if key not in seen and distance_m(lat, lng, point[0], point[1]) <= radius_m:
+                seen.add(key)
+                results.append(element)
+    return results
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import cached_property
+from urllib.parse import urlsplit, urlunsplit
+from bs4 import BeautifulSoup
+from leadflow_ai.services.fetcher import fetch_html
+from leadflow_ai.services.html_parser import parse_html
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form used as the store key: lowercase host, no fragment, default port or trailing slash."""
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "http").lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((scheme, host, path, parts.query, ""))
+
+
+@dataclass
+class PageContent:
+    """Rendered HTML of a page plus lazily parsed views shared by every reader."""
+    url: str
+    html: str
+
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        # Shared between readers: treat as read-only
+        return parse_html(self.html)
+
+    @cached_property
+    def visible_text(self) -> str:
+        return self.soup.get_text(separator=" ")
+
+    @cached_property
+    def text(self) -> str:
+        return self.soup.get_text(separator=" ", strip=True)
+
+    @cached_property
+    def footer_text(self) -> str:
+        footer = self.soup.find("footer")
+        return footer.get_text(separator=" ") if footer else ""
+
+
+class PageStore:
+    """
+    Per-run store of fetched pages keyed by normalized URL.
+
+    Each page is navigated at most once per run: concurrent readers of the same
+    URL wait on the same fetch. The store owns that fetch, so a reader that is
+    cancelled stops waiting without cancelling it for the others. Failed
+    fetches are not stored, so a later reader may retry.
+    """
+
+    def __init__(self):
+        self._pages: dict[str, asyncio.Task] = {}
+        self.fetches = 0
+        self.hits = 0
+
+    async def get(self, url: str, timeout: int = 20000) -> PageContent:
+        key = normalize_url(url)
+        task = self._pages.get(key)
+        if task is not None:
+            self.hits += 1
+        else:
+            task = asyncio.create_task(self._fetch(key, url, timeout))
+            # Failures are raised to the readers; don't warn when none is left to see them
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._pages[key] = task
+            self.fetches += 1
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key: str, url: str, timeout: int) -> PageContent:
+        try:
+            html = await fetch_html(url, timeout=timeout)
+        except BaseException:
+            del self._pages[key]
+            raise
+        return PageContent(url=key, html=html)
+
+    def cancel_pending(self):
+        """Cancel fetches still running, e.g. ones every reader gave up on."""
+        for task in self._pages.values():
+            task.cancel()
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+
+_current_store: ContextVar[PageStore | None] = ContextVar("page_store", default=None)
+
+
+@contextmanager
+def page_store_scope():
+    """Share one PageStore across everything run inside this block (e.g. one pipeline run)."""
+    store = PageStore()
+    token = _current_store.set(store)
+    try:
+        yield store
+    finally:
+        _current_store.reset(token)
+        store.cancel_pending()
+        logging.info(f"Page store: {store.fetches} navigations, {store.hits} reused")
+
+
+async def fetch_page(url: str, timeout: int = 20000) -> PageContent:
+    """Fetch a page through the current run's store, or directly when no run is active."""
+    store = _current_store.get()
+    if store is None:
+        html = await fetch_html(url, timeout=timeout)
+        return PageContent(url=normalize_url(url), html=html)
+    return await store.get(url, timeout=timeout)
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+from leadflow_ai.schemas.lead import AppState, Business
+from leadflow_ai.services.scrape_gogglemaps import collect_place_links, iter_business_details
+from leadflow_ai.services.email_finder_tool import find_business_email
+from leadflow_ai.services.summirize_business_and_pain_points import summarize_single_business, SUMMARY_FETCH_CONCURRENCY
+from leadflow_ai.services.generate_outreach_email import generate_outreach_for_business
+from leadflow_ai.services.page_store import page_store_scope
+
+
+def _event(stage: str, index: int | None = None, business: Business | None = None, **extra) -> dict:
+    event = {"stage": stage, **extra}
+    if index is not None:
+        event["index"] = index
+    if business is not None:
+        event["business"] = business.model_dump()
+    return event
+
+
+async def stream_pipeline(state: AppState, skip: list[str] | tuple[str, ...] = ()):
+    """
+    Run the pipeline per business instead of per batch, yielding an event each
+    time a business finishes a stage.
+
+    Events are dicts with a ``stage`` of ``links`` (how many place links were
+    found), ``scraped``, ``email``, ``summary``, ``outreach`` (the business so
+    far, keyed by its ``index`` in the Maps results), ``skipped`` (no website
+    or no email), ``error`` (a stage failed for that business, e.g. its
+    summary), and finally ``done``. When the run itself fails (e.g. Maps
+    times out) the stream ends with an ``error`` event carrying no ``index``
+    instead of ``done``. ``skip`` takes the same stage names as the batch
+    pipeline; scraping always runs.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    fetch_limit = asyncio.Semaphore(SUMMARY_FETCH_CONCURRENCY)
+
+    async def process(index: int, business: Business):
+        try:
+            await queue.put(_event("scraped", index, business))
+            if "update_business_emails" not in skip:
+                if not await find_business_email(business):
+                    await queue.put(_event("skipped", index, business, reason="no_email"))
+                    return
+                await queue.put(_event("email", index, business))
+            if "summarize_business" not in skip:
+                await summarize_single_business(business, fetch_limit, bypass_cache=state.bypass_llm_cache,
+                                                raise_errors=True)
+                await queue.put(_event("summary", index, business))
+            if "generate_outreach_email" not in skip:
+                await generate_outreach_for_business(business, bypass_cache=state.bypass_llm_cache)
+                await queue.put(_event("outreach", index, business))
+        except Exception as e:
+            logging.warning(f"⚠️ Streaming pipeline failed for {business.name}: {e}")
+            await queue.put(_event("error", index, business, detail=str(e)))
+
+    async def produce():
+        # Runs in its own task so every per-business task shares this run's page store
+        with page_store_scope():
+            links = await collect_place_links(state)
+            await queue.put(_event("links", count=len(links)))
+            tasks = []
+            try:
+                async for index, details in iter_business_details(links):
+                    if details is None:
+                        await queue.put(_event("skipped", index, reason="no_website"))
+                        continue
+                    tasks.append(asyncio.create_task(process(index, Business(**details))))
+                await asyncio.gather(*tasks)
+            finally:
+                # On a client disconnect, stop businesses still holding browser leases or LLM calls
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+        await queue.put(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            if producer.done():
+                error = None if producer.cancelled() else producer.exception()
+                if error is not None:
+                    # The response is already streaming: flush what was found, then end
+                    # with an error event instead of cutting the body off
+                    logging.error(f"Streaming pipeline failed: {error}", exc_info=error)
+                    while not queue.empty():
+                        yield queue.get_nowait()
+                    yield _event("error", detail=str(error))
+                    return
+                event = await queue.get()
+            else:
+                getter = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait({getter, producer}, return_when=asyncio.FIRST_COMPLETED)
+                if getter not in done:
+                    getter.cancel()
+                    continue
+                event = getter.result()
+            if event is None:
+                break
+            yield event
+        yield _event("done")
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
@@ -0,0 +1,58 @@
+import os
+import logging
+import threading
+from functools import lru_cache
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class Lazy:
+    """
+    A client built by ``factory`` on first ``get()`` and shared afterwards.
+
+    Keeps SDK imports, credential checks and network calls out of module
+    import, so the API and UI start without touching OpenAI or Pinecone.
+    A lock makes concurrent first uses build the client once; a factory that
+    raises is retried on the next ``get()``.
+    """
+
+    def __init__(self, factory, name: str | None = None):
+        self.factory = factory
+        self.name = name or getattr(factory, "__name__", "client")
+        self._value = None
+        self._lock = threading.Lock()
+
+    @property
+    def created(self) -> bool:
+        return self._value is not None
+
+    def get(self):
+        if self._value is None:
+            with self._lock:
+                if self._value is None:
+                    self._value = self.factory()
+                    logging.debug(f"Created {self.name}")
+        return self._value
+
+    def reset(self):
+        with self._lock:
+            self._value = None
+
+
+@lru_cache(maxsize=None)
+def chat_model(model: str = "gpt-4o-mini", temperature: float = 0, max_retries: int = 2):
+    """
+    The shared ``ChatOpenAI`` for a model, temperature and SDK retry count;
+    langchain_openai is imported on first use. Models called through
+    ``llm_scheduler`` pass ``max_retries=0`` so the scheduler owns 429 backoff.
+    """
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(model=model, temperature=temperature, max_retries=max_retries)
+
+
+@lru_cache(maxsize=None)
+def openai_client():
+    """The shared synchronous OpenAI SDK client."""
+    from openai import OpenAI
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
@@ -0,0 +1,49 @@
+import time
+import asyncio
+
+
+class TokenBucket:
+    """
+    Async budget of ``capacity`` units that refills continuously over ``period`` seconds.
+
+    ``acquire`` waits (first come, first served) until enough units are
+    available. ``pause`` stops all acquisitions for a while, e.g. after the
+    upstream answered 429, and ``adjust`` corrects the balance once the real
+    cost of a request is known.
+    """
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1):
+        # A single request larger than the whole bucket still goes through once it is full
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def adjust(self, delta: float):
+        """Charge (positive) or refund (negative) ``delta`` units after the fact."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+    def pause(self, seconds: float):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
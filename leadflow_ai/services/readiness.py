@@ -0,0 +1,100 @@
+import asyncio
+import logging
+
+# Resolves once the DOM has seen no mutations for `quietMs`, or false at `ceilingMs`
+DOM_SETTLED_JS = """
+([quietMs, ceilingMs]) => new Promise(resolve => {
+    const finish = settled => {
+        observer.disconnect();
+        clearTimeout(quiet);
+        clearTimeout(ceiling);
+        resolve(settled);
+    };
+    const observer = new MutationObserver(() => {
+        clearTimeout(quiet);
+        quiet = setTimeout(() => finish(true), quietMs);
+    });
+    let quiet = setTimeout(() => finish(true), quietMs);
+    const ceiling = setTimeout(() => finish(false), ceilingMs);
+    observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+})
+"""
+
+FEED_SCROLL_JS = """
+const el = document.querySelector('div[role="feed"]');
+if (el) el.scrollBy(0, 1000);
+"""
+
+FEED_ITEMS_SELECTOR = 'div[role="feed"] > div > div > a'
+
+
+async def _first_ready(waiters: list, ceiling_ms: int) -> bool:
+    """Run the waiters concurrently and return True as soon as one of them succeeds."""
+    loop = asyncio.get_running_loop()
+    tasks = [asyncio.ensure_future(w) for w in waiters]
+    deadline = loop.time() + ceiling_ms / 1000
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, timeout=max(0, deadline - loop.time()), return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                return False
+            if any(not t.cancelled() and t.exception() is None and t.result() is not False for t in done):
+                return True
+        return False
+    finally:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def wait_for_dom_settled(page, quiet_ms: int = 400, ceiling_ms: int = 2000) -> bool:
+    return await page.evaluate(DOM_SETTLED_JS, [quiet_ms, ceiling_ms])
+
+
+async def wait_for_ready(page, selector: str | None = None, ceiling_ms: int = 2000, quiet_ms: int = 400) -> bool:
+    """
+    Wait until a freshly navigated page is usable instead of sleeping a fixed time.
+
+    With a ``selector`` this returns as soon as it is attached; otherwise as soon
+    as the network goes idle or the DOM stops mutating for ``quiet_ms``. The old
+    fixed delay is kept as ``ceiling_ms`` so this never waits longer than before.
+    Returns False when the ceiling was hit.
+    """
+    if selector:
+        waiters = [page.wait_for_selector(selector, state="attached", timeout=ceiling_ms)]
+    else:
+        waiters = [
+            page.wait_for_load_state("networkidle", timeout=ceiling_ms),
+            wait_for_dom_settled(page, quiet_ms, ceiling_ms),
+        ]
+    ready = await _first_ready(waiters, ceiling_ms)
+    if not ready:
+        logging.debug(f"Readiness ceiling of {ceiling_ms}ms hit for {page.url}")
+    return ready
+
+
+async def scroll_feed(page, target_count: int, max_rounds: int = 15, round_ms: int = 2000) -> int:
+    """
+    Scroll the Google Maps results feed until it holds ``target_count`` items or
+    stops growing. Each round waits for new items for at most ``round_ms``.
+    Returns the final item count.
+    """
+    count = await page.locator(FEED_ITEMS_SELECTOR).count()
+    for _ in range(max_rounds):
+        if count >= target_count:
+            break
+        await page.evaluate(FEED_SCROLL_JS)
+        try:
+            await page.wait_for_function(
+                "([selector, n]) => document.querySelectorAll(selector).length > n",
+                arg=[FEED_ITEMS_SELECTOR, count],
+                timeout=round_ms,
+            )
+        except Exception:
+            logging.info(f"Feed stopped growing at {count} items")
+            break
+        count = await page.locator(FEED_ITEMS_SELECTOR).count()
+    return count
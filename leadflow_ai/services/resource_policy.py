@@ -0,0 +1,122 @@
+import os
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from playwright.async_api import Error as PlaywrightError
+from dotenv import load_dotenv
+
+load_dotenv()
+
+RESOURCE_BLOCKING = os.getenv("RESOURCE_BLOCKING", "1").lower() not in ("0", "false", "no")
+
+# Playwright resource types each stage lets through ("*" for all); override
+# with e.g. ALLOW_RESOURCES_WEBSITE=document,script. Documents always load.
+DEFAULT_ALLOWED = {
+    # Maps builds its results feed in JavaScript and scrolls it with CSS
+    "maps": "document,script,xhr,fetch,stylesheet",
+    # Websites only reach the browser when they render in JavaScript; the DOM is all we read
+    "website": "document,script,xhr,fetch",
+}
+
+# Analytics and ad hosts no stage needs; BLOCKED_HOSTS adds more (comma separated)
+TRACKER_HOSTS = frozenset([
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "googleadservices.com", "facebook.net", "hotjar.com", "clarity.ms", "segment.io", "segment.com",
+    "mixpanel.com", "fullstory.com", "nr-data.net", "criteo.com", "adnxs.com", "taboola.com",
+    "outbrain.com", "bat.bing.com", "snap.licdn.com", "analytics.tiktok.com",
+    *(host.strip() for host in os.getenv("BLOCKED_HOSTS", "").split(",") if host.strip()),
+])
+
+# Per stage: navigations, load_ms, requests, blocked, bytes
+_stats: dict[str, Counter] = defaultdict(Counter)
+
+
+def allowed_types(stage: str) -> frozenset | None:
+    """Resource types ``stage`` may load, or None when it may load everything."""
+    value = os.getenv(f"ALLOW_RESOURCES_{stage.upper()}", DEFAULT_ALLOWED.get(stage, "*"))
+    if value.strip() == "*":
+        return None
+    return frozenset({"document", *(kind.strip() for kind in value.split(",") if kind.strip())})
+
+
+def is_tracker(url: str) -> bool:
+    host = (urlsplit(url).hostname or "").lower()
+    return any(host == tracker or host.endswith("." + tracker) for tracker in TRACKER_HOSTS)
+
+
+class ResourcePolicy:
+    """
+    Per-lease request interception for one stage. Requests whose resource type
+    is outside the stage's allow-list, or that go to a tracker host, are
+    aborted before they hit the network; everything else continues. Requests
+    and bytes received are counted either way, so runs with
+    RESOURCE_BLOCKING=0 give the baseline.
+    """
+
+    def __init__(self, stage: str, blocking: bool | None = None):
+        self.stage = stage
+        self.blocking = RESOURCE_BLOCKING if blocking is None else blocking
+        self.allowed = allowed_types(stage)
+        self.stats = _stats[stage]
+        self._page = None
+
+    def blocks(self, resource_type: str, url: str) -> bool:
+        return (self.allowed is not None and resource_type not in self.allowed) or is_tracker(url)
+
+    async def _route(self, route):
+        request = route.request
+        if self.blocks(request.resource_type, request.url):
+            self.stats["blocked"] += 1
+            await route.abort("blockedbyclient")
+        else:
+            await route.continue_()
+
+    async def _finished(self, request):
+        self.stats["requests"] += 1
+        try:
+            sizes = await request.sizes()
+        except PlaywrightError:
+            return
+        self.stats["bytes"] += max(sizes["responseBodySize"], 0) + max(sizes["responseHeadersSize"], 0)
+
+    async def attach(self, page):
+        self._page = page
+        page.on("requestfinished", self._finished)
+        if self.blocking:
+            # Routing turns off Chromium's HTTP cache for the page; the page cache covers repeats
+            await page.route("**/*", self._route)
+
+    async def detach(self):
+        page, self._page = self._page, None
+        if page is None:
+            return
+        page.remove_listener("requestfinished", self._finished)
+        if self.blocking:
+            await page.unroute("**/*", self._route)
+
+
+@contextmanager
+def measure_load(stage: str):
+    """Count the wrapped navigation (goto plus readiness wait) toward ``stage``'s load time."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _stats[stage]["navigations"] += 1
+        _stats[stage]["load_ms"] += round((time.perf_counter() - start) * 1000)
+
+
+def resource_stats() -> dict:
+    """Totals per stage plus bytes and load time per navigation."""
+    report = {}
+    for stage, counts in _stats.items():
+        navigations = counts["navigations"] or 1
+        report[stage] = {**counts, "blocking": RESOURCE_BLOCKING,
+                         "bytes_per_navigation": counts["bytes"] // navigations,
+                         "ms_per_navigation": counts["load_ms"] // navigations}
+    return report
+
+
+def reset_resource_stats():
+    _stats.clear()
@@ -1,27 +1,39 @@
+import os
+import json
 import asyncio
-from playwright.async_api import async_playwright
 import time, csv
 import logging
 from leadflow_ai.schemas.lead import AppState, Business
+from leadflow_ai.services.browser_pool import get_browser_pool
+from leadflow_ai.services.resource_policy import measure_load
+from leadflow_ai.services.readiness import wait_for_ready, scroll_feed
+from leadflow_ai.services.cache import get_page_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-async def scrape_google_maps(state: AppState):
+# Detail pages scraped at once (the browser pool size is the hard ceiling)
+MAPS_DETAIL_CONCURRENCY = int(os.getenv("MAPS_DETAIL_CONCURRENCY", "4"))
+# Seconds a "no website" result is remembered; it may come from a page that rendered slowly
+MAPS_NEGATIVE_TTL = float(os.getenv("MAPS_NEGATIVE_TTL", str(6 * 3600)))
+
+async def collect_place_links(state: AppState) -> list[str]:
     logging.info(f"Starting Google Maps scrape for query: {state.search_query}")
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.goto(f"https://www.google.com/maps/search/{state.search_query.replace(' ', '+')}")
-        await page.wait_for_selector('//div[@role="feed"]', timeout=10000)
-
-        # Scroll to load more cards by scrolling the feed container
-        for _ in range(15):
-            await page.evaluate("""
-            const el = document.querySelector('div[role="feed"]');
-            if (el) el.scrollBy(0, 1000);
-            """)
-            await asyncio.sleep(2)
+    cache = get_page_cache()
+    cache_key = f"{state.search_query.strip().lower()}|{state.max_links}"
+    entry = cache.get("maps_search", cache_key)
+    if entry and entry.fresh:
+        links = json.loads(entry.body)
+        logging.info(f"Found {len(links)} business links (cached)")
+        return links
+
+    async with get_browser_pool().lease(stage="maps") as page:
+        with measure_load("maps"):
+            await page.goto(f"https://www.google.com/maps/search/{state.search_query.replace(' ', '+')}")
+            await page.wait_for_selector('//div[@role="feed"]', timeout=10000)
+
+        # Scroll the feed container until it holds max_links cards or stops growing
+        await scroll_feed(page, state.max_links, max_rounds=15, round_ms=2000)
 
         # Extract place URLs from search results
         anchors = page.locator('//div[@role="feed"]/div/div/a')
@@ -31,29 +43,65 @@ async def scrape_google_maps(state: AppState):
             if href and "/maps/place/" in href:
                 links.append(href)
 
-        logging.info(f"Found {len(links)} business links")
+    logging.info(f"Found {len(links)} business links")
+    if links:
+        cache.set("maps_search", cache_key, json.dumps(links))
+    return links
 
-        business_details = []
-        for link in links:
-            logging.info(f"Scraping details for: {link}")
-            details = await scrape_business_details(link)
-            business_details.append(details)
+async def iter_business_details(links: list[str], concurrency: int = MAPS_DETAIL_CONCURRENCY):
+    """
+    Scrape detail pages with at most ``concurrency`` in flight, yielding
+    ``(index, details)`` as each one finishes. A failing link yields ``None``
+    for its details instead of aborting the batch.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
 
-        await browser.close()
-        logging.info("Completed Google Maps scrape")
-        return business_details
+    async def scrape(index, link):
+        async with semaphore:
+            logging.info(f"Scraping details for: {link}")
+            try:
+                return index, await scrape_business_details(link)
+            except Exception as e:
+                logging.error(f"Failed to scrape details for {link}: {e}")
+                return index, None
+
+    tasks = [asyncio.create_task(scrape(i, link)) for i, link in enumerate(links)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def scrape_google_maps(state: AppState, concurrency: int = MAPS_DETAIL_CONCURRENCY):
+    # The feed page goes back to the pool before the detail pages lease theirs
+    links = await collect_place_links(state)
+
+    business_details = [None] * len(links)
+    async for index, details in iter_business_details(links, concurrency):
+        business_details[index] = details
+
+    logging.info("Completed Google Maps scrape")
+    return business_details
 
 async def scrape_business_details(url):
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        try:
-            await page.goto(url, timeout=60000)  # Increase timeout to 60 seconds
-        except Exception as e:
-            logging.error(f"Failed to load {url}: {e}")
-            return None  # Return None or handle as needed to skip this URL
-
-        await asyncio.sleep(3)  # wait for content to load
+    # Details are cached; "no website" results for MAPS_NEGATIVE_TTL, and only
+    # when the page evidently rendered; load failures are not cached
+    cache = get_page_cache()
+    entry = cache.get("maps", url)
+    if entry and entry.fresh:
+        return json.loads(entry.body)
+
+    async with get_browser_pool().lease(stage="maps") as page:
+        with measure_load("maps"):
+            try:
+                await page.goto(url, timeout=60000)  # Increase timeout to 60 seconds
+            except Exception as e:
+                logging.error(f"Failed to load {url}: {e}")
+                return None  # Return None or handle as needed to skip this URL
+
+            # Wait for the website button to render; 3s was the old fixed delay
+            ready = await wait_for_ready(page, selector='[data-item-id="authority"]', ceiling_ms=3000)
 
         try:
             name = (await page.title()).split(" - Google Maps")[0]
@@ -66,23 +114,28 @@ async def scrape_business_details(url):
         #     location = ""
         try:
             address_button = page.locator('//button[contains(@aria-label, "Address:")]').first
-            aria_label = await address_button.get_attribute("aria-label")
+            aria_label = await address_button.get_attribute("aria-label", timeout=1000)
             location = aria_label.split("Address:")[1].strip() if aria_label else ""
         except Exception as e:
             logging.error(f"[Warning] Failed to extract address: {e}")
             location = ""
 
         try:
-            website = await page.locator('//*[@data-item-id="authority"]').first.get_attribute("href")
+            website = await page.locator('//*[@data-item-id="authority"]').first.get_attribute("href", timeout=1000)
         except:
             website = ""
 
-        await browser.close()
         # 🚫 Skip businesses without a website
         if not website:
             logging.info(f"⏭️ Skipping '{name}' — no website found.")
+            # No website button and no address either: the page most likely hadn't
+            # rendered yet, so let the next run look again
+            if ready or location:
+                cache.set("maps", url, json.dumps(None), ttl=MAPS_NEGATIVE_TTL)
             return None
-        return {"name": name, "location": location, "website": website, "url": url}
+        details = {"name": name, "location": location, "website": website, "url": url}
+        cache.set("maps", url, json.dumps(details))
+        return details
 
 async def scrape_google_maps_node(state: AppState) -> dict:
     """
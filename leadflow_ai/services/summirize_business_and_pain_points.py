@@ -1,43 +1,45 @@
-from langchain_openai import ChatOpenAI
-from leadflow_ai.agents.email_finder_agent import fetch_page_html
 from langchain_core.prompts import PromptTemplate
-from leadflow_ai.schemas.lead import AppState
-from playwright.async_api import async_playwright
+from leadflow_ai.schemas.lead import AppState, Business
+from leadflow_ai.services.page_store import fetch_page
+from leadflow_ai.services.browser_pool import BROWSER_POOL_SIZE
+from leadflow_ai.services.llm_cache import CachedLLM
+from leadflow_ai.services.providers import Lazy, chat_model
+from leadflow_ai.services.html_parser import TextIndex, parse_html
+import os
 import logging
 import asyncio
 import re
+from contextlib import nullcontext
 
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+# Created on the first summary, not at import
+llm = Lazy(lambda: chat_model("gpt-4o-mini", max_retries=0), "summary model")
+
+# Website fetches in flight during summarization; LLM calls are capped separately by LLM_CONCURRENCY
+SUMMARY_FETCH_CONCURRENCY = int(os.getenv("SUMMARY_FETCH_CONCURRENCY", str(BROWSER_POOL_SIZE)))
 
 
 async def fetch_page_html_async(url: str) -> str:
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        try:
-            await page.goto(url, timeout=20000)
-            await page.wait_for_timeout(2000)
-            html = await page.content()
-            return html
-        finally:
-            await browser.close()
-
-from bs4 import BeautifulSoup
-import re
+    # Served from the run's page store when the email finder already loaded it
+    page = await fetch_page(url, timeout=20000)
+    return page.html
 
 def extract_business_relevant_text(html: str, min_len: int = 40) -> str:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parse_html(html)
 
     # Remove irrelevant tags
     for tag in soup(["script", "style", "noscript", "iframe", "svg", "footer", "nav", "form", "aside"]):
         tag.decompose()
 
+    # Every element's text from one pass over the tree, instead of get_text() per
+    # candidate (nested divs made that quadratic)
+    index = TextIndex(soup)
+
     # 1. Gather main hero and headings
     sections = []
 
     # Headings
     headings = soup.find_all(["h1", "h2", "h3"])
-    sections += [h.get_text(" ", strip=True) for h in headings if h.get_text(strip=True)]
+    sections += [index.text(h) for h in headings if index.has_text(h)]
 
     # 2. Look for 'about', 'services', 'what we do', etc. in ids/classes
     keywords = re.compile(r'(about|service|what[\s\-]?we[\s\-]?do|company|solution)', re.I)
@@ -49,23 +51,19 @@ def extract_business_relevant_text(html: str, min_len: int = 40) -> str:
         )
     )
     for s in special_sections:
-        text = s.get_text(" ", strip=True)
-        if len(text) > min_len:
-            sections.append(text)
+        if index.length(s) > min_len:
+            sections.append(index.text(s))
 
     # 3. Main tag/body fallback
     main = soup.find("main")
     if main:
-        main_text = main.get_text(" ", strip=True)
-        if len(main_text) > min_len:
-            sections.append(main_text)
+        if index.length(main) > min_len:
+            sections.append(index.text(main))
     else:
-        # Fallback: get longest text block in body
-        candidates = [block.get_text(" ", strip=True) for block in soup.find_all("div") if block.get_text(strip=True)]
-        if candidates:
-            candidates = sorted(candidates, key=len, reverse=True)
-            if len(candidates[0]) > min_len:
-                sections.append(candidates[0])
+        # Fallback: get longest text block in body (the first one on ties)
+        longest = max((block for block in soup.find_all("div") if index.has_text(block)), key=index.length, default=None)
+        if longest is not None and index.length(longest) > min_len:
+            sections.append(index.text(longest))
 
     # 4. Remove duplicates & join
     seen = set()
@@ -112,6 +110,9 @@ Now analyze the following HTML:
 HTML:
 {html}
 """)
+# Same extracted text -> same summary: memoized across runs
+summary_llm = CachedLLM(llm, summary_prompt)
+
 def parse_summary_and_painpoints(text):
     # Use forgiving patterns that just look for the section headers
     summary_match = re.search(
@@ -129,23 +130,36 @@ def parse_summary_and_painpoints(text):
     pain_points_str = "; ".join(pain_points) if pain_points else ""
     return summary, pain_points_str
 
-async def summarize_business(state: AppState) -> dict:
-    for business in state.businesses:
-        
-        try:
-            logging.info(f"🧠 Summarizing business: {business.name}")
+async def summarize_single_business(business: Business, fetch_limit: asyncio.Semaphore | None = None,
+                                    bypass_cache: bool = False, raise_errors: bool = False) -> Business:
+    """
+    Fetch, extract and summarize one business in place. Failures are logged,
+    and only raised with ``raise_errors``.
+    """
+    try:
+        logging.info(f"🧠 Summarizing business: {business.name}")
+        async with fetch_limit or nullcontext():
             html = await fetch_page_html_async(business.website)
-            visible_text = extract_business_relevant_text(html)
-            prompt = summary_prompt.format(html=visible_text)
-            response_msg = await llm.ainvoke(prompt)
-            response = response_msg.content if hasattr(response_msg, 'content') else str(response_msg)
-            
-            summary, pain_points = parse_summary_and_painpoints(response)
-            business.summary = summary or ""
-            business.pain_points = str(pain_points or "")
-            logging.info(f"Pain points: {business.pain_points}")
-
-        except Exception as e:
-            logging.warning(f"⚠️ Failed to summarize {business.name}: {e}")
+        visible_text = extract_business_relevant_text(html)
+        response_msg = await summary_llm.ainvoke({"html": visible_text}, bypass=bypass_cache)
+        response = response_msg.content if hasattr(response_msg, 'content') else str(response_msg)
+
+        summary, pain_points = parse_summary_and_painpoints(response)
+        business.summary = summary or ""
+        business.pain_points = str(pain_points or "")
+        logging.info(f"Pain points: {business.pain_points}")
 
+    except Exception as e:
+        logging.warning(f"⚠️ Failed to summarize {business.name}: {e}")
+        if raise_errors:
+            raise
+    return business
+
+async def summarize_business(state: AppState) -> dict:
+    # Each business runs fetch -> extract -> LLM on its own, so page loads for
+    # one business overlap with LLM calls for others
+    fetch_limit = asyncio.Semaphore(SUMMARY_FETCH_CONCURRENCY)
+    await asyncio.gather(*(
+        summarize_single_business(b, fetch_limit, bypass_cache=state.bypass_llm_cache) for b in state.businesses
+    ))
     return {"businesses": state.businesses}
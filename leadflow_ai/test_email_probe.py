@@ -0,0 +1,44 @@
+import asyncio
+from leadflow_ai.services import page_store
+from leadflow_ai.services.page_store import page_store_scope
+from leadflow_ai.services.email_finder_tool import find_email_for_website
+
+# Two locations of one chain: both probe the shared /contact page. Location 1
+# also links to a team page that answers first with a confident email, so it
+# stops early while location 2 is still waiting on /contact.
+PAGES = {
+    "https://chain.example.org/loc1": (0.01, "<a href='/loc1/team'>Contact the team</a>"),
+    "https://chain.example.org/loc2": (0.05, "<p>Welcome</p>"),
+    "https://chain.example.org/loc1/team": (0.1, "<p>Write to info@chain.example.org</p>"),
+    "https://chain.example.org/contact": (0.3, "<p>Contact us: contact@chain.example.org</p>"),
+    "https://chain.example.org/about": (0.3, "<p>About us</p>"),
+}
+
+
+async def fake_fetch_html(url: str, timeout: int = 20000) -> str:
+    delay, body = PAGES[page_store.normalize_url(url)]
+    await asyncio.sleep(delay)
+    return f"<html><body>{body}</body></html>"
+
+
+async def find_both():
+    with page_store_scope():
+        return await asyncio.gather(
+            find_email_for_website("https://chain.example.org/loc1"),
+            find_email_for_website("https://chain.example.org/loc2"),
+        )
+
+
+def test_early_exit_keeps_shared_probe():
+    original, page_store.fetch_html = page_store.fetch_html, fake_fetch_html
+    try:
+        first, second = asyncio.run(find_both())
+    finally:
+        page_store.fetch_html = original
+    print("Results:", first, second)
+    assert first == {"email": "info@chain.example.org", "source": "smart_extractor"}
+    assert second == {"email": "contact@chain.example.org", "source": "smart_extractor"}
+
+
+if __name__ == "__main__":
+    test_early_exit_keeps_shared_probe()
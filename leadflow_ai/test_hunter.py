@@ -1,10 +1,11 @@
+import asyncio
 from services.hunter import get_contacts
 
-def test_hunter():
+async def test_hunter():
     domain = "hyatt.com"  # Replace with a domain you want to test
-    contacts = get_contacts(domain)
+    contacts = await get_contacts(domain)
     print("Contacts:", contacts)
 
 # Run the test
 if __name__ == "__main__":
-    test_hunter()
+    asyncio.run(test_hunter())
@@ -26,6 +26,21 @@ export interface LogEntry {
   timestamp: Date
 }
 
+interface PipelineEvent {
+  stage: "links" | "scraped" | "email" | "summary" | "outreach" | "skipped" | "error" | "done"
+  index?: number
+  business?: Business
+  count?: number
+  detail?: string
+}
+
+const STAGE_LABELS: Record<string, string> = {
+  scraped: "scraped",
+  email: "email found",
+  summary: "summarized",
+  outreach: "outreach email written",
+}
+
 // Counter for unique IDs
 let logCounter = 0
 
@@ -54,11 +69,11 @@ export default function Dashboard() {
       addLog(`Starting pipeline for: "${query}"`, "info")
       addLog("Connecting to API...", "info")
 
-      const response = await fetch("http://127.0.0.1:8000/run-leadflow-pipeline", {
+      const response = await fetch("http://127.0.0.1:8000/run-leadflow-pipeline/stream", {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
-          Accept: "application/json",
+          Accept: "application/x-ndjson",
         },
         mode: "cors",
         body: JSON.stringify({
@@ -69,26 +84,56 @@ export default function Dashboard() {
 
       addLog(`API Response Status: ${response.status}`, response.ok ? "success" : "error")
 
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
         const errorText = await response.text()
         throw new Error(`HTTP ${response.status}: ${errorText}`)
       }
 
-      addLog("Parsing response data...", "info")
-      const data = await response.json()
-      const businessData = data.businesses || []
-
-      addLog(`Found ${businessData.length} businesses`, "success")
-
-      if (businessData.length > 0) {
-        addLog("Processing business summaries...", "info")
-        addLog("Generating outreach emails...", "info")
-        addLog("Pipeline completed successfully!", "success")
-      } else {
-        addLog("No businesses found for this query", "warning")
+      // Businesses keyed by their position in the Maps results, updated as each stage finishes
+      const byIndex = new Map<number, Business>()
+      const publish = () =>
+        setBusinesses(
+          [...byIndex.entries()].sort(([a], [b]) => a - b).map(([, business]) => business),
+        )
+
+      const handleEvent = (event: PipelineEvent) => {
+        switch (event.stage) {
+          case "links":
+            addLog(`Found ${event.count} businesses on Google Maps`, "info")
+            break
+          case "skipped":
+            if (event.index !== undefined && byIndex.delete(event.index)) publish()
+            if (event.business) addLog(`Skipped ${event.business.name}: no valid email`, "warning")
+            break
+          case "error":
+            addLog(`Failed on ${event.business?.name}: ${event.detail}`, "error")
+            break
+          case "done":
+            addLog(`Pipeline completed with ${byIndex.size} businesses`, byIndex.size ? "success" : "warning")
+            break
+          default:
+            if (event.business && event.index !== undefined) {
+              byIndex.set(event.index, event.business)
+              publish()
+              addLog(`${event.business.name}: ${STAGE_LABELS[event.stage] ?? event.stage}`, "info")
+            }
+        }
       }
 
-      setBusinesses(businessData)
+      const reader = response.body.getReader()
+      const decoder = new TextDecoder()
+      let buffered = ""
+      while (true) {
+        const { done, value } = await reader.read()
+        if (done) break
+        buffered += decoder.decode(value, { stream: true })
+        const lines = buffered.split("\n")
+        buffered = lines.pop() ?? ""
+        for (const line of lines) {
+          if (line.trim()) handleEvent(JSON.parse(line))
+        }
+      }
+      if (buffered.trim()) handleEvent(JSON.parse(buffered))
     } catch (error) {
       console.error("Pipeline error:", error)
       const errorMessage = error instanceof Error ? error.message : "Unknown error occurred"